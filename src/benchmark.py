@@ -0,0 +1,225 @@
+# Advent of Code 2022, Benchmark
+# (c) blu3r4y
+
+import argparse
+import inspect
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import generators
+import inputs
+import parsecache
+from inputs import puzzle_input
+from runner import DAYS, call_part, format_duration, import_day, solutions
+
+
+def measure(module, part, data, trials, warmup, parse_cache=False, load_only=False):
+    # bypass the printing decorators, we only want the raw solution
+    func = inspect.unwrap(solutions(module)[part])
+    tload, tsolve, answer = [], [], None
+
+    for i in range(warmup + trials):
+        # parts may mutate their input, so every trial parses it again
+        t0 = time.perf_counter()
+        parsed = parsecache.load(module, data) if parse_cache else module.load(data)
+        t1 = time.perf_counter()
+        answer = call_part(func, parsed) if not load_only else None
+        t2 = time.perf_counter()
+
+        if i >= warmup:
+            tload.append(t1 - t0)
+            tsolve.append(t2 - t1)
+
+    return {"answer": str(answer), "load": summarize(tload), "solve": summarize(tsolve)}
+
+
+def summarize(samples):
+    return {
+        "median": statistics.median(samples),
+        "p95": percentile(samples, 95),
+        "mean": statistics.fmean(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "trials": len(samples),
+    }
+
+
+def percentile(samples, q):
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+
+def synthetic_input(day, scale, seed):
+    # generated inputs are kept in the store, so that large ones are generated once
+    name = f"synthetic/day{day}-{generators.fingerprint(day)}-x{scale:g}-seed{seed}"
+    if (key := inputs.resolve(name)) is None:
+        key = inputs.put(generators.generate(day, scale, seed), name)
+    return inputs.read(key)
+
+
+def exponent(scales, medians):
+    # least-squares slope in log-log space, i.e., runtime grows like scale^exponent
+    xs, ys = [math.log(s) for s in scales], [math.log(m) for m in medians]
+    xm, ym = statistics.fmean(xs), statistics.fmean(ys)
+    var = sum((x - xm) ** 2 for x in xs)
+    return sum((x - xm) * (y - ym) for x, y in zip(xs, ys)) / var if var else None
+
+
+def curves(results, metric="solve"):
+    # group the median solve (or load) times of all scales by day and part
+    grouped = {}
+    for r in results:
+        grouped.setdefault((r["day"], r["part"]), []).append(r)
+    return {
+        key: ([r["scale"] for r in rs], [r[metric]["median"] for r in rs])
+        for key, rs in grouped.items()
+    }
+
+
+def print_curves(results, metric="solve"):
+    scales = sorted({r["scale"] for r in results})
+    header = ["Day", "Part"] + [f"x{s:g}" for s in scales] + ["Exponent"]
+
+    rows = []
+    for (day, part), (xs, ys) in curves(results, metric).items():
+        medians = dict(zip(xs, ys))
+        k = exponent(xs, ys) if len(xs) > 1 else None
+        rows.append(
+            [str(day), str(part)]
+            + [format_duration(medians.get(s)) for s in scales]
+            + [f"{k:.2f}" if k is not None else "-"]
+        )
+
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print(" | ".join(c.rjust(w) for c, w in zip(row, widths)))
+
+
+def plot_curves(results, path, metric="solve"):
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    for (day, part), (xs, ys) in curves(results, metric).items():
+        ax.loglog(xs, ys, marker="o", label=f"day {day} part {part}")
+
+    ax.set_xlabel("input scale")
+    ax.set_ylabel(f"median {metric} time [s]")
+    ax.legend(fontsize="small")
+    fig.savefig(path)
+
+
+def metadata():
+    try:
+        cmd = ["git", "rev-parse", "--short", "HEAD"]
+        commit = subprocess.run(cmd, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def print_table(results, baseline=None):
+    # index baseline results by (day, part) to compare medians
+    before = {(r["day"], r["part"]): r for r in (baseline or {}).get("results", [])}
+
+    header = ["Day", "Part", "Load (median)", "Solve (median)", "Solve (p95)"]
+    header += ["Change"] if baseline else []
+    rows = []
+    for r in results:
+        row = [
+            str(r["day"]),
+            str(r["part"]),
+            format_duration(r["load"]["median"]),
+            format_duration(r["solve"]["median"]),
+            format_duration(r["solve"]["p95"]),
+        ]
+        if baseline:
+            old = before.get((r["day"], r["part"]))
+            ratio = r["solve"]["median"] / old["solve"]["median"] if old else None
+            row.append(f"{ratio:.2f}x" if ratio is not None else "-")
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print(" | ".join(c.rjust(w) for c, w in zip(row, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark solutions")
+    parser.add_argument("days", nargs="*", type=int, default=DAYS, help="days to run")
+    parser.add_argument("-n", "--trials", type=int, default=10)
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument("-o", "--output", type=Path, help="write results as json")
+    parser.add_argument("-c", "--compare", type=Path, help="json of a previous run")
+    parser.add_argument(
+        "--offline", action="store_true", default=None, help="never fall back to aocd"
+    )
+    parser.add_argument(
+        "-s", "--sweep", type=float, nargs="+", help="scales of synthetic inputs"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of synthetic inputs")
+    parser.add_argument("--plot", type=Path, help="plot the complexity curves")
+    parser.add_argument(
+        "--parse-cache", action="store_true", help="cache parsed inputs on disk"
+    )
+    parser.add_argument(
+        "--load-only", action="store_true", help="only measure input parsing"
+    )
+    args = parser.parse_args(argv)
+    metric = "load" if args.load_only else "solve"
+
+    results = []
+    for day in args.days:
+        module = import_day(day)
+
+        # either sweep synthetic inputs of different sizes, or take the real one
+        if args.sweep:
+            datasets = [(s, synthetic_input(day, s, args.seed)) for s in args.sweep]
+        else:
+            datasets = [(None, puzzle_input(day, offline=args.offline))]
+
+        # parsing is the same for all parts
+        parts = list(solutions(module))[:1] if args.load_only else solutions(module)
+        for part in parts:
+            for scale, data in datasets:
+                stats = measure(
+                    module,
+                    part,
+                    data,
+                    args.trials,
+                    args.warmup,
+                    args.parse_cache,
+                    args.load_only,
+                )
+                scale = {"scale": scale} if scale is not None else {}
+                results.append({"day": day, "part": part, **scale, **stats})
+
+    if args.sweep:
+        print_curves(results, metric)
+        if args.plot:
+            plot_curves(results, args.plot, metric)
+    else:
+        baseline = json.loads(args.compare.read_text()) if args.compare else None
+        print_table(results, baseline)
+
+    if args.output:
+        report = {"meta": metadata(), "results": results}
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
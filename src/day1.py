@@ -1,12 +1,11 @@
 # Advent of Code 2022, Day 1
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
+from inputs import puzzle_input
+from profiling import instrument
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(elves):
     calories = []
     for elf in elves:
@@ -17,8 +16,7 @@ def part1(elves):
     return max(calories)
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(elves):
     calories = []
     for elf in elves:
@@ -34,11 +32,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=1)
+    data = puzzle_input(1)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 67658
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 200158
-    # puzzle.answer_b = ans2
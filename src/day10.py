@@ -1,15 +1,17 @@
 # Advent of Code 2022, Day 10
 # (c) blu3r4y
 
-import matplotlib.pyplot as plt
 import numpy as np
-from aocd.models import Puzzle
-from funcy import collecting, print_calls, print_durations
-from parse import parse
+from funcy import collecting
 
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
 
-@print_calls
-@print_durations(unit="ms")
+ADDX = Format("addx {:d}")
+
+
+@instrument
 def part1(instructions):
     cycles = simulate(instructions)
 
@@ -21,8 +23,7 @@ def part1(instructions):
     return strength
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(instructions):
     # use zero-based indexing again
     cycles = simulate(instructions)[1:]
@@ -36,6 +37,8 @@ def part2(instructions):
                 crt[row][col] = 1
             i += 1
 
+    import matplotlib.pyplot as plt
+
     plt.imshow(crt, cmap="gray")
     plt.show()
 
@@ -58,17 +61,15 @@ def simulate(instructions):
 def load(data):
     for line in data.split("\n"):
         if line.startswith("addx"):
-            yield parse("addx {:d}", line)[0]
+            yield ADDX.match(line)[0]
         elif line.startswith("noop"):
             yield 0
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=10)
+    data = puzzle_input(10)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 14920
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     # assert ans2 == "BUCACBUZ"
-    # puzzle.answer_b = ans2
@@ -6,21 +6,29 @@ from collections import deque, namedtuple
 from operator import __add__, __mul__
 from typing import List, Optional
 
-from aocd.models import Puzzle
-from funcy import collecting, print_calls, print_durations
-from parse import parse
+from funcy import collecting
+
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
 
 Monkey = namedtuple("Monkey", ["no", "start", "op", "test", "iftrue", "iffalse"])
+MONKEY = Format(
+    "Monkey {:d}:\n"
+    "  Starting items: {}\n"
+    "  Operation: new = old {} {:w}\n"
+    "  Test: divisible by {:d}\n"
+    "    If true: throw to monkey {:d}\n"
+    "    If false: throw to monkey {:d}"
+)
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(monkeys):
     return solve(monkeys, nrounds=20, div=3)
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(monkeys):
     lcm = math.lcm(*[monkey.test for monkey in monkeys])
     return solve(monkeys, nrounds=10_000, mod=lcm)
@@ -64,16 +72,7 @@ def inspect(item, op):
 
 @collecting
 def load(data):
-    monkeys = data.split("\n\n")
-    for monkey in monkeys:
-        no, start, op, test, iftrue, iffalse = monkey.split("\n")
-        no = parse("Monkey {:d}:", no)[0]
-        start = parse("  Starting items: {}", start)[0]
-        op = parse("  Operation: new = old {} {:w}", op)
-        test = parse("  Test: divisible by {:d}", test)[0]
-        iftrue = parse("    If true: throw to monkey {:d}", iftrue)[0]
-        iffalse = parse("    If false: throw to monkey {:d}", iffalse)[0]
-
+    for no, start, *op, test, iftrue, iffalse in MONKEY.findall(data):
         # fixup start list
         start = deque(map(int, start.split(", ")))
 
@@ -86,12 +85,10 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=11)
+    data = puzzle_input(11)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 108240
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 25712998901
-    # puzzle.answer_b = ans2
@@ -1,68 +1,59 @@
 # Advent of Code 2022, Day 12
 # (c) blu3r4y
 
-from collections import defaultdict
+import numpy as np
 
-import networkx as nx
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
+from grid import Grid
+from inputs import puzzle_input
+from profiling import instrument
 
 
-@print_calls
-@print_durations(unit="ms")
-def part1(graph, pos):
-    start, end = pos["S"][0], pos["E"][0]
-    return nx.shortest_path_length(graph, start, end)
+@instrument
+def part1(grid: Grid, start: int, end: int):
+    return int(distances(grid, end)[start])
 
 
-@print_calls
-@print_durations(unit="ms")
-def part2(graph, pos):
+@instrument
+def part2(grid: Grid, start: int, end: int):
     # fewest steps from any "a" node to "z" node
-    end, lengths = pos["E"][0], []
-    for xy in pos["a"]:
-        try:
-            length = nx.shortest_path_length(graph, xy, end)
-            lengths.append(length)
-        except nx.NetworkXNoPath:
-            pass
+    dist = distances(grid, end)[grid.find(ord("a"))]
+    return int(dist[dist >= 0].min())
 
-    return min(lengths)
 
+def distances(grid: Grid, end: int) -> np.ndarray:
+    # breadth-first search backwards from the end, on packed indices,
+    # where -1 marks all cells that can not reach the end
+    heights = grid.flat.astype(int)
+    dist = np.full(grid.size, -1)
+    dist[end], frontier, steps = 0, np.array([end]), 0
 
-def load(data):
-    graph, pos = nx.DiGraph(), defaultdict(list)
+    while frontier.size > 0:
+        steps += 1
+        nbrs, valid = grid.neighbors(frontier)
+        nbrs = np.where(valid, nbrs, 0)
+
+        # we could have come from there if it is at most one lower
+        valid &= heights[nbrs] + 1 >= heights[frontier][:, None]
+        valid &= dist[nbrs] < 0
 
-    # map letters to (x, y) coordinates with height
-    for y, line in enumerate(data.splitlines()):
-        for x, c in enumerate(line):
-            pos[c].append((x, y))
-            c = c.replace("S", "a").replace("E", "z")
-            graph.add_node((x, y), height=ord(c))
+        frontier = np.unique(nbrs[valid])
+        dist[frontier] = steps
 
-    # add edge if destination is reachable
-    for x, y in graph.nodes:
-        src = x, y
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            dst = x + dx, y + dy
-            if dst in graph:
-                hsrc = graph.nodes[src]["height"]
-                hdst = graph.nodes[dst]["height"]
+    return dist
 
-                # add edge if destination is at most one higher
-                if hsrc + 1 >= hdst:
-                    graph.add_edge(src, dst)
 
-    return graph, pos
+def load(data):
+    grid = Grid.parse(data)
+    start, end = grid.find(ord("S"))[0], grid.find(ord("E"))[0]
+    grid.flat[start], grid.flat[end] = ord("a"), ord("z")
+    return grid, int(start), int(end)
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=12)
+    data = puzzle_input(12)
 
-    ans1 = part1(*load(puzzle.input_data))
+    ans1 = part1(*load(data))
     assert ans1 == 425
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(*load(puzzle.input_data))
+    ans2 = part2(*load(data))
     assert ans2 == 418
-    # puzzle.answer_b = ans2
@@ -5,14 +5,15 @@ import json
 from collections import namedtuple
 from functools import cmp_to_key
 
-from aocd.models import Puzzle
-from funcy import collecting, lcat, print_calls, print_durations
+from funcy import collecting, lcat
+
+from inputs import puzzle_input
+from profiling import instrument
 
 Pair = namedtuple("Pair", ["left", "right"])
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(pairs):
     total = 0
     for i, pair in enumerate(pairs, 1):
@@ -23,8 +24,7 @@ def part1(pairs):
     return total
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(pairs):
     # flatten packets and add divider packets
     packets = lcat(pairs) + [[[2]], [[6]]]
@@ -76,12 +76,10 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=13)
+    data = puzzle_input(13)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 6086
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 27930
-    # puzzle.answer_b = ans2
@@ -2,79 +2,118 @@
 # (c) blu3r4y
 
 import numpy as np
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
-from parse import parse
+
+from grid import Grid
+from inputs import puzzle_input
+from parsing import ints
+from profiling import instrument
 
 EMPTY, STONE, SAND = 0, 1, 2
 
 
-@print_calls
-@print_durations(unit="ms")
-def part1(grid, x=500, y=0):
+@instrument
+def part1(grid: Grid, x=500, y=0):
     return solve(grid, x=x, y=y)
 
 
-@print_calls
-@print_durations(unit="ms")
-def part2(grid, pad=500):
-    # expand grid 2 in y (to draw a floor) and pad in x to make room for sand
-    grid = np.pad(grid, ((0, 2), (pad, pad)), mode="constant", constant_values=EMPTY)
-    grid[-1, :] = STONE
-
-    # drop sand until the source is blocked
-    return solve(grid, x=500 + pad, y=0)
-
-
-def solve(grid, x, y):
-    count = 0
-    while drop(grid, x, y):
+@instrument
+def part2(grid: Grid, pad=None, mode="simulate"):
+    # expand grid 2 in y (to draw a floor) and pad in x to make room for sand,
+    # which piles up to a triangle below the source at x = 500 that reaches
+    # at most as far to each side as the floor is deep
+    if pad is None:
+        reach = grid.height + 2
+        left, right = max(0, reach - 500), max(0, 500 + reach - (grid.width - 1))
+    else:
+        left, right = pad, pad
+
+    grid = grid.pad(((0, 2), (left, right)), fill=EMPTY)
+    grid.row(-1)[:] = STONE
+
+    # either drop sand until the source is blocked, or count it row by row
+    assert mode in ("simulate", "sweep")
+    if mode == "sweep":
+        return sweep(grid, x=500 + left, y=0)
+    return solve(grid, x=500 + left, y=0)
+
+
+def solve(grid: Grid, x, y):
+    # the path of the falling sand is kept on a stack, because the next grain
+    # follows the same path up to the last free position of the previous grain
+    cells, w, size = grid.buffer, grid.width, grid.size
+    count, path = 0, [grid.pack(y, x)]
+
+    while path:
+        i = path[-1]
+
+        # is the source free?
+        if cells[i] != EMPTY:
+            path.pop()
+            continue
+
+        while True:
+            below, x = i + w, i % w
+            # will sand flow into the void?
+            if below >= size:
+                return count
+            # can we move down?
+            if cells[below] == EMPTY:
+                i = below
+            # can we move left?
+            elif x > 0 and cells[below - 1] == EMPTY:
+                i = below - 1
+            # can we move right?
+            elif x + 1 < w and cells[below + 1] == EMPTY:
+                i = below + 1
+            # are we blocked?
+            else:
+                break
+            path.append(i)
+
+        # the grain rests at the end of the path, the next one starts before it
+        cells[path.pop()] = SAND
         count += 1
+
     return count
 
 
-def drop(grid, x, y):
-    h, w = grid.shape
-
-    # is the source free?
-    if grid[y, x] != EMPTY:
-        return False
-
-    while y + 1 < h:
-        # can we move down?
-        if grid[y + 1, x] == EMPTY:
-            y += 1
-        # can we move left?
-        elif x > 0 and grid[y + 1, x - 1] == EMPTY:
-            y += 1
-            x -= 1
-        # can we move right?
-        elif x + 1 < w and grid[y + 1, x + 1] == EMPTY:
-            y += 1
-            x += 1
-        # are we blocked?
-        else:
+def sweep(grid: Grid, x, y):
+    # with a floor, sand eventually rests on every cell that it can reach,
+    # i.e., the cells below and diagonally below sand, unless there is stone
+    free = grid.cells != STONE
+
+    # one more column on each side, which stays empty
+    sand = np.zeros(grid.width + 2, dtype=bool)
+    sand[x + 1] = free[y, x]
+
+    count = int(sand[x + 1])
+    for r, row in enumerate(free[y + 1 :], start=1):
+        # sand spreads by at most one column per row, so we only update the
+        # columns [lo, hi] of this row, which contain all sand of the row above
+        lo, hi = max(x - r, 0), min(x + r, grid.width - 1)
+        spread = sand[lo : hi + 1] | sand[lo + 1 : hi + 2] | sand[lo + 2 : hi + 3]
+        spread &= row[lo : hi + 1]
+        sand[lo + 1 : hi + 2] = spread
+        count_row = np.count_nonzero(spread)
+        count += count_row
+
+        # no sand in this row means no sand below it either
+        if not count_row:
             break
 
-    # will sand flow into the void?
-    if y == h - 1:
-        return False
-
-    grid[y, x] = SAND
-    return True
+    return int(count)
 
 
-def load(data):
+def load(data) -> Grid:
     traces = []
     for trace in data.split("\n"):
-        lines = trace.split(" -> ")
-        lines = [parse("{:d},{:d}", line).fixed for line in lines]
-        traces.append(lines)
+        points = ints(trace)
+        traces.append(list(zip(points[::2], points[1::2])))
 
     # build matrix
     w = max([x for x, y in np.concatenate(traces)])
     h = max([y for x, y in np.concatenate(traces)])
-    grid = np.full((h + 1, w + 1), fill_value=EMPTY, dtype=int)
+    grid = Grid.full(h + 1, w + 1, fill=EMPTY)
 
     # draw lines
     for trace in traces:
@@ -87,12 +126,13 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=14)
+    data = puzzle_input(14)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 683
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 28821
-    # puzzle.answer_b = ans2
+
+    # counting row by row must agree with the simulation
+    assert part2(load(data), mode="sweep") == ans2
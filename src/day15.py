@@ -2,79 +2,45 @@
 # (c) blu3r4y
 
 from collections import namedtuple
-from itertools import combinations
+from typing import Iterator
 
-from aocd.models import Puzzle
-from funcy import collecting, lfilter, print_calls, print_durations
-from parse import parse
+import numpy as np
+from funcy import collecting
+
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
 
 # coordinates of the sensor (s) and its beacon (b)
 RawSensor = namedtuple("RawSensor", ["sx", "sy", "bx", "by"])
 Sensor = namedtuple("Sensor", ["sx", "sy", "bx", "by", "radius"])
+SENSOR = Format("Sensor at x={:d}, y={:d}: closest beacon is at x={:d}, y={:d}")
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(sensors, y=2_000_000):
     sensors = process_sensors(sensors)
     occupied = occupied_positions(sensors)
 
-    # horizontal bounds for exhaustive scan
-    xmin = min(s.sx - s.radius for s in sensors)
-    xmax = max(s.sx + s.radius for s in sensors)
-
-    # only keep sensors that possibly intersect the horizontal line
-    intersect = lambda s: s.sy - s.radius <= y <= s.sy + s.radius
-    sensors = lfilter(intersect, sensors)
-
-    # scan the entire horizontal line
-    ncells = 0
-    x = xmin
-    while x <= xmax:
-        sensor = within_sensor(x, y, sensors)
-        if sensor is None:
-            x += 1
-            continue
-
-        # jump to the next cell right after this sensor
-        jump = sensor.sx + sensor.radius - abs(sensor.sy - y) + 1
-        ncells += jump - x
-        x = jump
-
     # do not count the already occupied positions
+    ncells = int(coverage(sensors, [y])[0])
     ncells -= sum(1 for (_, oy) in occupied if y == oy)
 
     # number of postions that can contain no beacon
     return ncells
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(sensors, limit=4_000_000):
     sensors = process_sensors(sensors)
-    occupied = occupied_positions(sensors)
 
-    isensors = set()
-    for s1, s2 in combinations(sensors, 2):
-        # if two sensors are are exactly this far apart
-        # they will leave a gap of exactly 1 between them
-        dist = abs(s1.sx - s2.sx) + abs(s1.sy - s2.sy)
-        if dist == s1.radius + s2.radius + 2:
-            isensors.add(s1)
-            isensors.add(s2)
-
-    # iterate over remaining sensor borders (start with small radiuses)
-    isensors = sorted(isensors, key=lambda s: s.radius)
-    for x, y in all_sensor_outlines(isensors, pad=1):
-        # stay within the specified bounds
-        if not (0 <= x <= limit and 0 <= y <= limit):
-            continue
-        if (x, y) in occupied:
-            continue
-
-        # the first point that is NOT within the range of ANY sensor
-        if within_sensor(x, y, sensors) is None:
-            return x * 4_000_000 + y
+    # the one position that is within bounds but NOT within the range of ANY sensor
+    positions = uncovered(sensors, region=((0, limit), (0, limit)))
+    if not positions:
+        raise ValueError(f"every position up to {limit} is within range of a sensor")
+
+    x, y = positions[0]
+    return x * 4_000_000 + y
 
 
 @collecting
@@ -85,6 +51,32 @@ def process_sensors(sensors):
         yield Sensor(*s, radius)
 
 
+def coverage(sensors, ys) -> np.ndarray:
+    # number of cells in each of the rows that are within range of any sensor,
+    # where each sensor covers one interval per row, which are sorted by their
+    # start and merged, i.e., each interval only adds what lies beyond all
+    # intervals that start before it, for all rows at once (or a single row)
+    sx, sy, radius = sensor_arrays(sensors)
+    ys = np.atleast_1d(np.asarray(ys, dtype=np.int64))[:, None]
+
+    # rows that a sensor does not reach get an empty interval
+    half = np.maximum(radius - np.abs(sy - ys), -1)
+    order = np.argsort(sx - half, axis=1)
+    starts = np.take_along_axis(sx - half, order, axis=1)
+    ends = np.take_along_axis(sx + half, order, axis=1)
+
+    # the furthest end of all intervals before each interval
+    reach = np.maximum.accumulate(ends, axis=1)
+    reach = np.concatenate((starts[:, :1] - 1, reach[:, :-1]), axis=1)
+    return np.maximum(ends - np.maximum(starts - 1, reach), 0).sum(axis=1)
+
+
+def sensor_arrays(sensors):
+    # x, y coordinates and radius of all sensors, as separate arrays
+    sensors = np.array([(s.sx, s.sy, s.radius) for s in sensors], dtype=np.int64)
+    return sensors[:, 0], sensors[:, 1], sensors[:, 2]
+
+
 def occupied_positions(sensors):
     # positions already occupied by beacons or sensors
     beacons = set((s.bx, s.by) for s in sensors)
@@ -92,45 +84,65 @@ def occupied_positions(sensors):
     return beacons | sensors
 
 
-def within_sensor(x, y, sensors):
-    # check if the point is within the range of any sensor
-    for sensor in sensors:
-        dist = abs(sensor.sx - x) + abs(sensor.sy - y)
-        if dist <= sensor.radius:
-            return sensor
-
+def uncovered(sensors, region):
+    # positions in the (inclusive) region ((xmin, xmax), (ymin, ymax)) that
+    # are not within the range of any sensor, but next to a position that is,
+    # i.e., exactly the uncovered positions on the outline of some sensor,
+    # where rotating to u = x + y and v = x - y turns the diamonds into squares,
+    # with their outlines on the lines u = su +- (r + 1) and v = sv +- (r + 1)
+    sx, sy, radius = sensor_arrays(sensors)
+    su, sv = sx + sy, sx - sy
+    (xmin, xmax), (ymin, ymax) = region
+
+    # walk along the two u-sides of each outline and collect the v-coordinates
+    # that no sensor covers within the region, and then the same with u and v
+    # swapped, where each side only spans its own sensor's outline
+    positions = set()
+    for u0, v0, r in zip(su.tolist(), sv.tolist(), radius.tolist()):
+        for u in (u0 - r - 1, u0 + r + 1):
+            lo = max(2 * xmin - u, u - 2 * ymax, v0 - r - 1)
+            hi = min(2 * xmax - u, u - 2 * ymin, v0 + r + 1)
+            for v in line_gaps(u, su, sv, radius, lo, hi):
+                positions.add(((u + v) // 2, (u - v) // 2))
+
+        for v in (v0 - r - 1, v0 + r + 1):
+            lo = max(2 * xmin - v, 2 * ymin + v, u0 - r - 1)
+            hi = min(2 * xmax - v, 2 * ymax + v, u0 + r + 1)
+            for u in line_gaps(v, sv, su, radius, lo, hi):
+                positions.add(((u + v) // 2, (u - v) // 2))
+
+    return sorted(positions)
+
+
+def line_gaps(line, along, across, radius, lo, hi) -> Iterator[int]:
+    # the coordinates within [lo, hi] on a rotated line that no sensor covers,
+    # where only coordinates with the same parity as the line are positions
+    near = np.abs(along - line) <= radius
+    covered = sorted(
+        zip((across - radius)[near].tolist(), (across + radius)[near].tolist())
+    )
+
+    t = lo + (lo - line) % 2
+    for a, b in covered:
+        if t > hi:
+            return
+        if a > t:
+            yield from range(t, min(a - 1, hi) + 1, 2)
+        if b >= t:
+            t = b + 1 + (b + 1 - line) % 2
+
+    yield from range(t, hi + 1, 2)
 
-def all_sensor_outlines(sensors, pad=0):
-    for sensor in sensors:
-        yield from sensor_outline(sensor, pad=pad)
 
-
-def sensor_outline(sensor, pad=0):
-    # all points on the outline of the sensor, i.e.,
-    # those that are exactly at the range of the sensor,
-    # plus an optional padding to possibly extend the range
-    limit = sensor.radius + pad
-    for d in range(limit):
-        yield (sensor.sx + d, sensor.sy + limit - d)
-        yield (sensor.sx - d, sensor.sy + limit - d)
-        yield (sensor.sx + d, sensor.sy - limit + d)
-        yield (sensor.sx - d, sensor.sy - limit + d)
-
-
-@collecting
 def load(data):
-    pattern = "Sensor at x={:d}, y={:d}: closest beacon is at x={:d}, y={:d}"
-    for line in data.split("\n"):
-        yield RawSensor(*parse(pattern, line).fixed)
+    return [RawSensor(*m) for m in SENSOR.findall(data)]
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=15)
+    data = puzzle_input(15)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 5809294
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 10693731308112
-    # puzzle.answer_b = ans2
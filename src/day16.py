@@ -1,116 +1,166 @@
 # Advent of Code 2022, Day 16
 # (c) blu3r4y
 
-from collections import namedtuple
-from functools import cache
-from itertools import combinations
-from typing import Dict, Tuple
+from collections import defaultdict, namedtuple
+from typing import Dict
 
-import networkx as nx
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
-from parse import parse
+import numpy as np
+
+from graph import Graph
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
 
 Valve = namedtuple("Valve", ["name", "flow", "childs"])
-State = namedtuple("State", ["position", "minute", "pressure", "available"])
 
-DistDict = Dict[str, Dict[str, int]]
+# the lowest bits of a packed state, which hold its (inverted) pressure
+PRESSURE_MASK = (1 << 32) - 1
+
+PLURAL = Format("Valve {} has flow rate={:d}; tunnels lead to valves {}")
+SINGULAR = Format("Valve {} has flow rate={:d}; tunnel leads to valve {}")
 
 
 class Solver:
     def __init__(self, valves: Dict[str, Valve], start: str):
-        # prepare distance and flow dictionaries for fast lookup
-        G, dist = Solver._build_graph(valves, start)
-        self.flows = {n: valves[n].flow for n in G.nodes}
-        self.nodes = frozenset(G.nodes) - {start}
-        self.start = start
-        self.dist = dist
+        # valves are numbered, the start being 0, so that a set of opened
+        # valves is a bitmask, and distances and flows are arrays by number,
+        # valves without flow are never opened, so they are contracted away
+        graph, nodes = Graph.from_adjacency({v.name: v.childs for v in valves.values()})
+        names = [start] + sorted(n for n in nodes if valves[n].flow > 0 and n != start)
+        self.flows = np.array([valves[n].flow for n in names])
+        self.dist = graph.contract([nodes.index(n) for n in names])
+        self.start = 0
 
     def solve_human(self, total_minutes: int) -> int:
-        start = State(self.start, total_minutes, 0, self.nodes)
-        return self.ddfs(start, with_elephant=False)
+        return self.solve(total_minutes, agents=1)
 
     def solve_human_and_elephant(self, total_minutes: int) -> int:
-        start = State(self.start, total_minutes, 0, self.nodes)
-        return self.ddfs(start, with_elephant=True)
-
-    @cache
-    def ddfs(self, node: State, with_elephant):
-        # doing a depth-first search is the best approximation that we have here
-        # https://en.wikipedia.org/wiki/Longest_path_problem#Parameterized_complexity
-        maximum = 0
-        for s in self.successors(node):
-            inner = s.pressure + self.ddfs(s, with_elephant)
-            maximum = max(maximum, inner)
-
-        # how much could the elephant do in the same time
-        # given the valves that the human already opened
-        elephant = State(self.start, 26, 0, node.available)
-        emax = self.ddfs(elephant, with_elephant=False) if with_elephant else 0
-
-        return max(maximum, emax)
-
-    def successors(self, node: State):
-        for target in node.available:
-            # time it takes to get to the target and open the valve
-            # and total pressure that is released additionally
-            duration = self.dist[node.position][target] + 1
-            if duration <= node.minute:
-                pressure = (node.minute - duration) * self.flows[target]
-                yield State(
-                    position=target,
-                    minute=node.minute - duration,
-                    pressure=pressure,
-                    available=node.available - {target},
-                )
-
-    @staticmethod
-    def _build_graph(valves: Dict[str, Valve], start: str) -> Tuple[nx.Graph, DistDict]:
-        G = nx.Graph()
-        for valve in valves.values():
-            for child in valve.childs:
-                G.add_edge(valve.name, child, weight=1)
-
-        # compute all shortest paths and reduce to transitive
-        # closure, i.e. skip valves that have zero flow entirely
-        dist = dict(nx.all_pairs_shortest_path_length(G))
-        for node in valves.keys():
-            if valves[node].flow == 0 and node != start:
-                for a, b in combinations(G.neighbors(node), 2):
-                    G.add_edge(a, b, weight=dist[a][b])
-                G.remove_node(node)
-
-        return G, dist
-
-
-@print_calls
-@print_durations(unit="ms")
+        return self.solve(total_minutes, agents=2)
+
+    def solve(self, total_minutes: int, agents: int) -> int:
+        # all agents open disjoint sets of valves, so we first find the best
+        # pressure for every set, and then the best partition of all valves
+        best = self.pressures(total_minutes)
+        if agents == 1:
+            return int(best.max())
+
+        # the best pressure of all other agents, within each set of valves
+        others = subset_max(best)
+        for _ in range(agents - 2):
+            others = subset_max(combine(best, others))
+
+        full = len(best) - 1
+        return int((best + others[full ^ np.arange(len(best))]).max())
+
+    def pressures(self, total_minutes: int) -> np.ndarray:
+        # dynamic programming over (position, minutes left, opened valves),
+        # layer by layer, where each layer holds the states with the same
+        # minutes left and only the best pressure per state survives,
+        # yields the best pressure for every set of opened valves
+        n = len(self.flows)
+        bits = 1 << np.arange(n)
+        best = np.zeros(1 << n, dtype=np.int64)
+
+        layers = defaultdict(list)
+        layers[total_minutes].append(([self.start], [0], [0]))
+
+        for minute in range(total_minutes, 0, -1):
+            if not layers[minute]:
+                continue
+
+            position, opened, pressure = map(np.concatenate, zip(*layers.pop(minute)))
+            position, opened, pressure = dedupe(n, position, opened, pressure)
+            np.maximum.at(best, opened, pressure)
+
+            # walk to every closed valve and open it, if there is time left
+            left = minute - self.dist[position] - 1
+            moves = (opened[:, None] & bits == 0) & (left > 0) & (self.flows > 0)
+            source, target = np.nonzero(moves)
+            if len(source) == 0:
+                continue
+
+            left = left[source, target]
+
+            successors = (
+                left,
+                target,
+                opened[source] | bits[target],
+                pressure[source] + left * self.flows[target],
+            )
+
+            # group the successors by the minutes that are left for them
+            order = np.argsort(left, kind="stable")
+            bounds = np.flatnonzero(np.diff(left[order])) + 1
+            groups = [np.split(arr[order], bounds) for arr in successors]
+            for left, *successor in zip(*groups):
+                layers[int(left[0])].append(successor)
+
+        return best
+
+
+def dedupe(n: int, position, opened, pressure):
+    # sorts the states with their highest pressure first, packed into one integer
+    # with the pressure inverted in the lowest bits, and keeps the first of each
+    packed = np.sort((opened * n + position) << 32 | (PRESSURE_MASK - pressure))
+    state = packed >> 32
+    first = np.ones(len(packed), dtype=bool)
+    first[1:] = state[1:] != state[:-1]
+
+    opened, position = np.divmod(state[first], n)
+    return position, opened, PRESSURE_MASK - (packed[first] & PRESSURE_MASK)
+
+
+def subset_max(values: np.ndarray) -> np.ndarray:
+    # sum-over-subsets transform, with the maximum instead of the sum,
+    # i.e., the best value of all subsets of each bitmask
+    result = values.copy()
+    for i in range(len(result).bit_length() - 1):
+        pairs = result.reshape(-1, 2, 1 << i)
+        np.maximum(pairs[:, 1], pairs[:, 0], out=pairs[:, 1])
+    return result
+
+
+def combine(best: np.ndarray, others: np.ndarray) -> np.ndarray:
+    # the best value for each bitmask if one more agent opens some subset
+    # of it with `best`, and the others open the remaining valves
+    result = others.copy()
+    bits = (1 << np.arange(len(best).bit_length() - 1)).tolist()
+    for opened in np.flatnonzero(best).tolist():
+        # all sets of valves that are disjoint to the opened ones
+        rest = np.zeros(1, dtype=np.int64)
+        for bit in bits:
+            if not opened & bit:
+                rest = np.concatenate((rest, rest | bit))
+
+        union = opened | rest
+        result[union] = np.maximum(result[union], best[opened] + others[rest])
+
+    return result
+
+
+@instrument
 def part1(valves):
     return Solver(valves, "AA").solve_human(30)
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(valves):
     return Solver(valves, "AA").solve_human_and_elephant(26)
 
 
 def load(data):
-    pattern1 = "Valve {} has flow rate={:d}; tunnels lead to valves {}"
-    pattern2 = "Valve {} has flow rate={:d}; tunnel leads to valve {}"
-
     valves = {}
     for line in data.splitlines():
         name, flow, childs = None, None, None
 
         # parse plural string
-        if p1 := parse(pattern1, line):
-            name, flow, childs = p1.fixed
+        if p1 := PLURAL.match(line):
+            name, flow, childs = p1
             childs = childs.split(", ")
 
         # parse singular string
-        elif p2 := parse(pattern2, line):
-            name, flow, child = p2.fixed
+        elif p2 := SINGULAR.match(line):
+            name, flow, child = p2
             childs = [child]
 
         assert name is not None
@@ -122,12 +172,10 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=16)
+    data = puzzle_input(16)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 1873
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 2425
-    # puzzle.answer_b = ans2
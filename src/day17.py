@@ -1,14 +1,14 @@
 # Advent of Code 2022, Day 17
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
+from collections import namedtuple
+from typing import Iterator, List, Optional, Tuple
+
+from inputs import puzzle_input
+from profiling import instrument
 
 WIDTH = 7
 LEFT, RIGHT = -1, 1
-EMPTY, MOVING, SOLID = ".", "@", "#"
-EMPTY_LINE = [EMPTY] * WIDTH
-SOLID_LINE = [SOLID] * WIDTH
 ROCKS = [
     ["####"],
     [".#.", "###", ".#."],
@@ -17,221 +17,128 @@ ROCKS = [
     ["##", "##"],
 ]
 
+# each row of the tower is a 7-bit integer, where the leftmost column is the
+# highest bit, and a rock packs up to four rows into one integer, one per byte,
+# starting with its bottom row, such that moves are shifts of the entire rock
+LEFT_WALL, RIGHT_WALL = 0x40404040, 0x01010101
 
-@print_calls
-@print_durations(unit="ms")
-def part1(jets):
-    return solve(jets, limit=2022)
-
-
-@print_calls
-@print_durations(unit="ms")
-def part2(jets):
-    return solve(jets, limit=1000000000000)
-
-
-def solve(jets, limit):
-    # an empty tower with no rock placed
-    tower, height, itop = [], 0, -1
-    # number of rocks and jet and rock cycle counters
-    nrocks, ijet, irock = 0, 0, 0
-    # memorize towers to avoid cycles
-    known_towers = {}
-
-    # as long as jets are available
-    while nrocks < limit:
-
-        # spawn a new rock
-        itop = spawn_rock(tower, ROCKS[irock], itop)
-        irock = (irock + 1) % len(ROCKS)
-
-        # repeat jet-pushes and down-moves until the rock is solid
-        is_moving = True
-        while is_moving:
-            push_rock(tower, itop, jets[ijet])
-            ijet = (ijet + 1) % len(jets)
-            itop, is_moving = down_rock(tower, itop)
-
-        nrocks += 1
-        itop = tower_height(tower) - 1
-
-        ## cycle detection
-        ###################
-
-        # possibly shrink the tower and update indexes
-        delta, tower = shrink_tower(tower)
-        itop -= delta
-        height += delta
-
-        # memorize the tower
-        thash = pack_tower(tower, irock, ijet)
-        if not thash in known_towers:
-            known_towers[thash] = (height, nrocks)
-            continue
-
-        # we found a circle! what was the difference?
-        theight, trocks = known_towers[thash]
-        dheight, drocks = height - theight, nrocks - trocks
-
-        # stack up the difference as much as we can
-        nstacks = (limit - nrocks) // drocks
-        nrocks += nstacks * drocks
-        height += nstacks * dheight
-
-    # don't forget the height of the last active tower
-    height += itop + 1
-    return height
-
-
-def spawn_rock(tower, rock, itop):
-    itop = itop + 3 + len(rock)
-    expand_tower(tower, itop + 1)
-    for r, row in enumerate(reversed(rock)):
-        for c, col in enumerate(row):
-            if col == SOLID:
-                tower[itop - r][c + 2] = MOVING
-
-    # spawn position
-    return itop
-
-
-def push_rock(tower, itop, direction):
-    update = []
 
-    i = itop
-    while i >= 0:
-        try:
+def pack_rock(rock):
+    # bottom-up rows, spawned two columns away from the left wall
+    rows = [
+        sum(1 << (WIDTH - 3 - c) for c, ch in enumerate(row) if ch == "#")
+        for row in rock
+    ]
+    return sum(row << 8 * k for k, row in enumerate(rows))
 
-            # check if we can move in that direction
-            # or raise a ValueError
-            check = direction + (
-                WIDTH - 1 - tower[i][::-1].index(MOVING)
-                if direction == RIGHT
-                else tower[i].index(MOVING)
-            )
 
-            if check < 0 or check >= WIDTH or tower[i][check] == SOLID:
-                return  # rock is blocked, push not possible
+PACKED_ROCKS = [pack_rock(rock) for rock in ROCKS]
 
-            # prepare the line updates
-            line = tower[i].copy()
-            iterator = reversed(range(WIDTH)) if direction == RIGHT else range(WIDTH)
-            for j in iterator:
-                if tower[i][j] == MOVING:
-                    line[j] = EMPTY
-                    line[j + direction] = MOVING
-            update.append(line)
-
-            i -= 1  # move down
-
-        except ValueError:
-            break  # no more moving rocks
-
-    # update the tower with the moved lines
-    for i, line in enumerate(update):
-        tower[itop - i] = line
-
-
-def down_rock(tower, itop):
-    i = itop
-
-    while i > 0:
-        has_rock_line = False
-
-        # just check if we can move down
-        for u, d in zip(tower[i], tower[i - 1]):
-            if u == MOVING:
-                has_rock_line = True
-            if u == MOVING and d == SOLID:
-                # rock is blocked, can not move down, stop here
-                stop_rock(tower, itop)
-                return itop, False
-
-        # no more rocks on this line
-        if not has_rock_line:
-            break
-
-        i -= 1  # move down
-
-    # we hit the bottom, stop here
-    if MOVING in tower[0]:
-        stop_rock(tower, itop)
-        return itop, False
-
-    # actually move down (in-place)
-    while i < itop:
-        for j, (d, u) in enumerate(zip(tower[i], tower[i + 1])):
-            if u == MOVING:
-                tower[i][j] = MOVING
-                tower[i + 1][j] = EMPTY
-
-        i += 1  # move up
-
-    # successfully moved the rock one down
-    return itop - 1, True
-
-
-def stop_rock(tower, itop):
-    i = itop
-    while i >= 0:
-        solidified = False
-
-        # convert moving rocks to solid rocks (in-place)
-        for r in range(WIDTH):
-            if tower[i][r] == MOVING:
-                tower[i][r] = SOLID
-                solidified = True
-
-        # no more moving rocks on that line
-        if not solidified:
-            return
+# the columns of the solid cells in each possible row
+COLUMNS = [
+    [c for c in range(WIDTH) if row >> (WIDTH - 1 - c) & 1] for row in range(256)
+]
 
-        i -= 1  # move down
+# how deep we look into the columns for detecting cycles
+DEPTH = 63
 
+# a cycle starts after `offset` rocks, and every `length` rocks add `height`
+Cycle = namedtuple("Cycle", ["offset", "length", "height"])
 
-def shrink_tower(tower):
-    cutoff, pre = len(tower), [EMPTY]
-    for i, row in enumerate(reversed(tower)):
 
-        # the cutoff point is the first non-empty line
-        if not cutoff and row != EMPTY_LINE:
-            cutoff = len(tower) - i - 1
+@instrument
+def part1(jets):
+    return solve(jets, limit=2022)
 
-        # we split below the first truly solid line or one
-        # that is solid "together with the previous line", e.g.
-        # => pre .#.#.#.
-        # => row #.#.#.#
-        if all(a == SOLID or b == SOLID for a, b in zip(row, pre)):
-            height = len(tower) - i
-            return height, tower[height : cutoff + 1]
 
-        pre = row
+@instrument
+def part2(jets):
+    return solve(jets, limit=1000000000000)
 
-    return 0, tower[: cutoff + 1]
 
+def solve(jets, limit):
+    heights, cycle = find_cycle(jets, limit=limit)
+    if cycle is None:
+        return heights[limit]
+
+    # stack up as many cycles as we can, and look up the remaining rocks
+    ncycles, remainder = divmod(limit - cycle.offset, cycle.length)
+    return heights[cycle.offset + remainder] + ncycles * cycle.height
+
+
+def find_cycle(jets, depth=DEPTH, limit=None) -> Tuple[List[int], Optional[Cycle]]:
+    # the heights of the tower after 0, 1, 2, ... rocks, until the cycle is
+    # confirmed, i.e., the same state came up three times at equal distances,
+    # or until we dropped `limit` rocks without finding one
+    heights, seen = [0], {}
+    for nrocks, (height, key) in enumerate(simulate(jets, depth), start=1):
+        heights.append(height)
+        if nrocks == limit:
+            return heights, None
+
+        previous = seen.setdefault(key, [])
+        previous.append(nrocks)
+        if (
+            len(previous) >= 3
+            and previous[-1] - previous[-2] == previous[-2] - previous[-3]
+        ):
+            offset, length = previous[-2], previous[-1] - previous[-2]
+            return heights, Cycle(offset, length, heights[-1] - heights[offset])
+
+
+def simulate(jets, depth=DEPTH) -> Iterator[Tuple[int, int]]:
+    # the height of the tower after each rock, and a key of the state of the
+    # simulation, i.e., the next rock, the next jet and the surface profile
+    tower, top = bytearray(7), 0
+    columns = [0] * WIDTH
+    ijet, irock = 0, 0
+
+    # each column depth gets its own field in the key, wide enough for `depth`
+    bits = depth.bit_length()
+
+    while True:
 
-def tower_height(tower):
-    for i, row in enumerate(reversed(tower)):
-        if SOLID in row:
-            return len(tower) - i
+        # spawn a new rock
+        rock, y = PACKED_ROCKS[irock], top + 3
+        irock = (irock + 1) % len(PACKED_ROCKS)
 
-    return 0
+        # repeat jet-pushes and down-moves until the rock is solid
+        while True:
+            if jets[ijet] == LEFT and not rock & LEFT_WALL:
+                pushed = rock << 1
+            elif jets[ijet] == RIGHT and not rock & RIGHT_WALL:
+                pushed = rock >> 1
+            else:
+                pushed = rock
+            ijet = (ijet + 1) % len(jets)
 
+            if not pushed & rows(tower, y):
+                rock = pushed
+            if y == 0 or rock & rows(tower, y - 1):
+                break
+            y -= 1
 
-def expand_tower(tower, size):
-    while len(tower) < size:
-        tower.append(EMPTY_LINE.copy())
+        # solidify the rock and make room for the next one
+        tower[y : y + 4] = (rows(tower, y) | rock).to_bytes(4, "little")
+        for k, row in enumerate(rock.to_bytes(4, "little"), start=y + 1):
+            for c in COLUMNS[row]:
+                columns[c] = max(columns[c], k)
+        top = max(columns)
+        tower.extend(bytes(top + 7 - len(tower)))
 
+        # the depth of each column below the top, up to `depth`,
+        # packed into one integer together with the rock and jet index
+        key = 0
+        for c in columns:
+            key = key << bits | min(top - c, depth)
+        key = (key * len(jets) + ijet) * len(PACKED_ROCKS) + irock
 
-def pack_tower(tower, irock, ijet):
-    # packs the tower and cycle indexes into a hashable string
-    return str(irock) + "\n" + str(ijet) + "\n" + "\n".join(["".join(t) for t in tower])
+        yield top, key
 
 
-# def print_tower(tower):
-#     for i, row in enumerate(reversed(tower)):
-#         print(f"{len(tower) - i:3d} {''.join(row)}")
-#     print()
+def rows(tower, y):
+    # four rows of the tower, packed like a rock
+    return int.from_bytes(tower[y : y + 4], "little")
 
 
 def load(data):
@@ -239,12 +146,10 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=17)
+    data = puzzle_input(17)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 3163
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 1560932944615
-    # puzzle.answer_b = ans2
@@ -1,18 +1,18 @@
 # Advent of Code 2022, Day 18
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import collecting, print_calls, print_durations
+from funcy import collecting
 
+from inputs import puzzle_input
+from profiling import instrument
 
-@print_calls
-@print_durations(unit="ms")
+
+@instrument
 def part1(lava):
     return surface_area(lava)
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(lava):
     # bounding box with 1 extra padding layer to fit the water
     xs, ys, zs = zip(*lava)
@@ -74,12 +74,10 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=18)
+    data = puzzle_input(18)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 3500
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 2048
-    # puzzle.answer_b = ans2
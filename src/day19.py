@@ -1,14 +1,21 @@
 # Advent of Code 2022, Day 19
 # (c) blu3r4y
 
-from functools import lru_cache
-from math import ceil, comb, prod
+import multiprocessing as mp
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from heapq import nlargest
+from math import comb, inf, prod
+from operator import add
 from typing import Iterable, List, Tuple
 
-from aocd.models import Puzzle
-from funcy import collecting, print_calls, print_durations
-from parse import parse
-from tqdm import tqdm
+from funcy import collecting
+
+from inputs import puzzle_input
+from memo import memoize
+from parsing import Format
+from profiling import instrument
 
 ORE, CLA, OBS, GEO = 0, 1, 2, 3
 
@@ -16,152 +23,445 @@ ORE, CLA, OBS, GEO = 0, 1, 2, 3
 Quadruple = Tuple[int, int, int, int]
 Blueprint = Tuple[Quadruple, Quadruple, Quadruple, Quadruple]
 
+# rates, inventory and remaining time are packed into the 16-bit fields of
+# one integer, i.e., rates in the lowest four fields, followed by the inventory
+MASK, RATES = 0xFFFF, (1 << 64) - 1
+RATE_SHIFTS, INVENTORY_SHIFTS, TIME_SHIFT = (0, 16, 32, 48), (64, 80, 96, 112), 128
+
+BLUEPRINT = Format(
+    "Blueprint {:d}: "
+    "Each ore robot costs {:d} ore. "
+    "Each clay robot costs {:d} ore. "
+    "Each obsidian robot costs {:d} ore and {:d} clay. "
+    "Each geode robot costs {:d} ore and {:d} obsidian."
+)
+
 
 class Solver:
-    def __init__(self, blueprints: List[Blueprint]):
+    def __init__(
+        self,
+        blueprints: List[Blueprint],
+        processes: int = 1,
+        engine: str = "bnb",
+        width: int = None,
+    ):
         self.blueprints: List[Blueprint] = blueprints
         self.active_blueprint: Blueprint = None
         self.active_limits: Quadruple = None
+        self.active_builds: Quadruple = None
+
+        # either the memoized depth-first search, the branch-and-bound engine or
+        # the breadth-by-minute search, which is exact unless it has a beam width
+        assert engine in ("dfs", "bnb", "beam")
+        assert width is None or engine == "beam"
+        self.engine, self.width = engine, width
+
+        # blueprints are independent, so they can be solved in parallel,
+        # unless we are a daemon process (e.g. in the runner) ourselves
+        self.processes = processes or os.cpu_count()
+        if mp.current_process().daemon:
+            self.processes = 1
 
     def solve(self, time_limit: int) -> List[int]:
-        results, nstates = [], 0
+        from tqdm import tqdm
+
+        results, stats = [None] * len(self.blueprints), Counter()
         with tqdm(unit="blueprint", total=len(self.blueprints)) as pbar:
-            for blueprint in self.blueprints:
-                self.dfs.cache_clear()
-
-                # the maximum number of robots (excluding geodes)
-                # that we are allowed to build in total
-                self.active_limits = Solver.robot_limits(blueprint)
-                self.active_blueprint = blueprint
-
-                # compute the maximum number of geodes that we can build
-                # start at timestamp 1 with 1 ore already in the inventory
-                rates, inventory = (1, 0, 0, 0), (1, 0, 0, 0)
-                maxgeo = self.dfs(rates, inventory, time_limit - 1)
-                results.append(maxgeo)
-
-                # print debug info
-                ci = self.dfs.cache_info()
-                nstates += ci.hits + ci.misses
-                pbar.set_postfix(ngeo=sum(results), nstates=f"{nstates:,d}")
+            for i, maxgeo, bstats in self.solve_all(time_limit):
+                results[i] = maxgeo
+
+                # print debug info, where the cache is cleared for every
+                # blueprint, so its footprint is the peak and not the sum
+                for key, value in bstats.items():
+                    if key == "cachebytes":
+                        stats[key] = max(stats[key], value)
+                    else:
+                        stats[key] += value
+                ngeo = sum(r for r in results if r is not None)
+                pbar.set_postfix(ngeo=ngeo, **{k: f"{v:,d}" for k, v in stats.items()})
                 pbar.update()
 
+        self.stats = stats
         return results
 
-    # this should allocate no more than 12 GB memory
-    @lru_cache(maxsize=30_000_000)
-    def dfs(self, rates: Quadruple, inventory: Quadruple, t: int) -> int:
-        maxgeo = inventory[GEO]
+    def solve_all(self, time_limit: int) -> Iterable[Tuple[int, int, Counter]]:
+        # yields the index, the number of geodes and statistics of each blueprint
+        if self.processes == 1 or len(self.blueprints) == 1:
+            for i, blueprint in enumerate(self.blueprints):
+                yield i, *self.solve_blueprint(blueprint, time_limit)
+            return
+
+        # each worker process has its own solver and thus its own cache
+        with ProcessPoolExecutor(min(self.processes, len(self.blueprints))) as pool:
+            futures = {
+                pool.submit(
+                    solve_in_worker, blueprint, time_limit, self.engine, self.width
+                ): i
+                for i, blueprint in enumerate(self.blueprints)
+            }
+            for future in as_completed(futures):
+                yield futures[future], *future.result()
+
+    def solve_blueprint(
+        self, blueprint: Blueprint, time_limit: int
+    ) -> Tuple[int, Counter]:
+        if self.engine == "bnb":
+            bnb = BranchAndBound(blueprint)
+            maxgeo = bnb.solve(time_limit)
+            return maxgeo, Counter(expanded=bnb.expanded, pruned=bnb.pruned)
+
+        if self.engine == "beam":
+            beam = BeamSearch(blueprint, self.width)
+            maxgeo = beam.solve(time_limit)
+            return maxgeo, beam.stats
+
+        self.dfs.cache_clear()
+        self.active_blueprint, self.active_builds = blueprint, pack_builds(blueprint)
+
+        # the maximum number of robots (excluding geodes)
+        # that we are allowed to build in total
+        self.active_limits = Solver.robot_limits(blueprint)
+
+        # compute the maximum number of geodes that we can build
+        # start at timestamp 1 with 1 ore already in the inventory
+        state = pack(rates=(1, 0, 0, 0), inventory=(1, 0, 0, 0), t=time_limit - 1)
+        maxgeo = self.dfs(state)
+
+        ci = self.dfs.cache_info()
+        return maxgeo, Counter(nstates=ci.hits + ci.misses, cachebytes=ci.nbytes)
+
+    # this should allocate no more than 12 GB memory, the state is its own key
+    @memoize(budget="12G")
+    def dfs(self, state: int) -> int:
+        rore, rcla, robs, rgeo = (state >> s & MASK for s in RATE_SHIFTS)
+        ore, cla, obs, geo = (state >> s & MASK for s in INVENTORY_SHIFTS)
+        t = state >> TIME_SHIFT
+        maxgeo = geo
 
         if t <= 0:  # [prune] out of time
             return maxgeo
 
         if t == 1:  # [prune] no need to build robots in the last minute
-            return maxgeo + rates[GEO]
+            return maxgeo + rgeo
 
         # [prune] assuming we only build geode robots from now on,
         # is it even possible to increase the current maximum?
-        optgeo = inventory[GEO] + rates[GEO] * t + comb(t, 2)
+        optgeo = geo + rgeo * t + comb(t, 2)
         if optgeo <= maxgeo:
             return maxgeo
 
-        for robot in self.available_robots(rates):
+        # the production of one minute, shifted onto the inventory fields
+        produced = (state & RATES) << INVENTORY_SHIFTS[0]
+        (
+            (oore, _, _, _),
+            (core, _, _, _),
+            (bore, bcla, _, _),
+            (gore, _, gobs, _),
+        ) = self.active_blueprint
+
+        for robot in self.available_robots(rore, rcla, robs):
             # [prune] compute how long we have to wait until we have the
             # required resources and skip to that timestamp already
             # plus one minute to build the robot after that
-            costs = self.active_blueprint[robot]
-            goals = Solver.subtract_quadruples(costs, inventory)
-            dt = Solver.minutes_until_resources(rates, goals) + 1
+            if robot == GEO:
+                dt = max(wait(gore - ore, rore), wait(gobs - obs, robs)) + 1
+            elif robot == OBS:
+                dt = max(wait(bore - ore, rore), wait(bcla - cla, rcla)) + 1
+            elif robot == CLA:
+                dt = wait(core - ore, rore) + 1
+            else:
+                dt = wait(oore - ore, rore) + 1
 
-            dt = max(1, dt)
             if dt > t:  # [prune] not enough time to get there
                 continue
 
-            # recurse depth-first
-            nrates, ninv = self.step(rates, inventory, robot=robot, t=dt)
-            maxgeo = max(maxgeo, self.dfs(nrates, ninv, t - dt))
+            # produce for dt minutes, build the robot and advance the clock,
+            # i.e., update all fields at once without unpacking them
+            nstate = state + produced * dt + self.active_builds[robot]
+            nstate -= dt << TIME_SHIFT
+            maxgeo = max(maxgeo, self.dfs(nstate))
 
         return maxgeo
 
-    def available_robots(self, rates: Quadruple) -> Iterable[int]:
-        rore, rcla, robs, _ = rates
-        if rore > 0 and robs > 0:
+    def available_robots(self, rore: int, rcla: int, robs: int) -> Iterable[int]:
+        # we start with an ore robot, so there is always some ore
+        if robs > 0:
             yield GEO
-        if rore > 0 and rcla > 0 and robs < self.active_limits[OBS]:
+        if rcla > 0 and robs < self.active_limits[OBS]:
             yield OBS
-        if rore > 0 and rcla < self.active_limits[CLA]:
+        if rcla < self.active_limits[CLA]:
             yield CLA
-        if rore > 0 and rore < self.active_limits[ORE]:
+        if rore < self.active_limits[ORE]:
             yield ORE
 
-    def step(
-        self, rates: Quadruple, inventory: Quadruple, robot: int, t: int = 1
-    ) -> Tuple[Quadruple, Quadruple]:
-        costs = self.active_blueprint[robot]
-        new_inventory, new_rates = [], []
-
-        for j, (iv, rt, ct) in enumerate(zip(inventory, rates, costs)):
-            # current items + produced items - consumed items
-            new_inventory.append(iv + rt * t - ct)
-            new_rates.append(rt + 1 if j == robot else rt)
-
-        return tuple(new_rates), tuple(new_inventory)
-
-    @staticmethod
-    def minutes_until_resources(rates: Quadruple, goals: Quadruple) -> int:
-        # number of minutes until we have `goal` resources with the given `rates`
-        return max(0 if g <= 0 else ceil(g / r) for r, g in zip(rates, goals))
-
     @staticmethod
     def robot_limits(blueprint: Blueprint) -> Quadruple:
         # number of robots to build until we can build every robot every minute
         return tuple(max(c) for c in zip(*blueprint))
 
-    @staticmethod
-    def subtract_quadruples(a: Quadruple, b: Quadruple) -> Quadruple:
-        # element-wise subtraction of two quadruples
-        return tuple(ai - bi for ai, bi in zip(a, b))
 
+class BranchAndBound:
+    def __init__(self, blueprint: Blueprint):
+        (self.ore_ore, *_), (self.cla_ore, *_), obs, geo = blueprint
+        self.obs_ore, self.obs_cla = obs[ORE], obs[CLA]
+        self.geo_ore, self.geo_obs = geo[ORE], geo[OBS]
+
+        # we can only spend so much of each resource per minute
+        self.max_ore = max(self.ore_ore, self.cla_ore, self.obs_ore, self.geo_ore)
+
+        # the incumbent, i.e., the best number of geodes found so far
+        # in any branch, plus the number of expanded and pruned nodes
+        self.best, self.expanded, self.pruned = 0, 0, 0
+
+    def solve(self, time_limit: int) -> int:
+        self.best, self.expanded, self.pruned = 0, 0, 0
+        self.search(time_limit, 1, 0, 0, 0, 0, 0, 0, 0)
+        return self.best
+
+    def search(self, t, rore, rcla, robs, rgeo, ore, cla, obs, geo):
+        # t minutes left, with robots (r...) and resources in the inventory
+        self.expanded += 1
+
+        # [bound] we can at least wait until the end
+        self.best = max(self.best, geo + rgeo * t)
+
+        # [prune] not even a relaxed problem can beat the incumbent
+        if self.upper_bound(t, rcla, robs, rgeo, cla, obs, geo) <= self.best:
+            self.pruned += 1
+            return
+
+        # branches are ordered so that good incumbents are found early,
+        # i.e., we consider geode robots first and ore robots last
+        if robs > 0:
+            dt = 1 + max(wait(self.geo_ore - ore, rore), wait(self.geo_obs - obs, robs))
+            if dt < t:
+                self.search(
+                    t - dt,
+                    rore,
+                    rcla,
+                    robs,
+                    rgeo + 1,
+                    ore + rore * dt - self.geo_ore,
+                    cla + rcla * dt,
+                    obs + robs * dt - self.geo_obs,
+                    geo + rgeo * dt,
+                )
+
+        # [prune] never build more robots than we can spend resources per minute,
+        # or when the inventory already suffices for the rest of the time
+        if rcla > 0 and robs < self.geo_obs and obs + robs * t < self.geo_obs * t:
+            dt = 1 + max(wait(self.obs_ore - ore, rore), wait(self.obs_cla - cla, rcla))
+            if dt < t:
+                self.search(
+                    t - dt,
+                    rore,
+                    rcla,
+                    robs + 1,
+                    rgeo,
+                    ore + rore * dt - self.obs_ore,
+                    cla + rcla * dt - self.obs_cla,
+                    obs + robs * dt,
+                    geo + rgeo * dt,
+                )
+
+        if rcla < self.obs_cla and cla + rcla * t < self.obs_cla * t:
+            dt = 1 + wait(self.cla_ore - ore, rore)
+            if dt < t:
+                self.search(
+                    t - dt,
+                    rore,
+                    rcla + 1,
+                    robs,
+                    rgeo,
+                    ore + rore * dt - self.cla_ore,
+                    cla + rcla * dt,
+                    obs + robs * dt,
+                    geo + rgeo * dt,
+                )
+
+        if rore < self.max_ore and ore + rore * t < self.max_ore * t:
+            dt = 1 + wait(self.ore_ore - ore, rore)
+            if dt < t:
+                self.search(
+                    t - dt,
+                    rore + 1,
+                    rcla,
+                    robs,
+                    rgeo,
+                    ore + rore * dt - self.ore_ore,
+                    cla + rcla * dt,
+                    obs + robs * dt,
+                    geo + rgeo * dt,
+                )
+
+    def upper_bound(self, t, rcla, robs, rgeo, cla, obs, geo) -> int:
+        # relaxation, where ore is free and we may build one robot of each kind
+        # per minute, as long as there is enough clay and obsidian for it
+        for _ in range(t):
+            build_obs, build_geo = cla >= self.obs_cla, obs >= self.geo_obs
+            cla += rcla - self.obs_cla * build_obs
+            obs += robs - self.geo_obs * build_geo
+            geo += rgeo
+            rcla, robs, rgeo = rcla + 1, robs + build_obs, rgeo + build_geo
+        return geo
+
+
+def pack(rates: Quadruple, inventory: Quadruple, t: int) -> int:
+    fields = zip(RATE_SHIFTS + INVENTORY_SHIFTS, rates + inventory)
+    return sum(v << s for s, v in fields) | t << TIME_SHIFT
+
+
+def pack_builds(blueprint: Blueprint) -> Quadruple:
+    # what building each robot adds to a packed state, i.e., one to its rate
+    # minus its costs in the inventory, fields never underflow if affordable
+    return tuple(
+        (1 << RATE_SHIFTS[robot]) - pack((0, 0, 0, 0), costs, 0)
+        for robot, costs in enumerate(blueprint)
+    )
+
+
+class BeamSearch:
+    def __init__(self, blueprint: Blueprint, width: int = None):
+        self.bnb = BranchAndBound(blueprint)
+        self.width = width
+
+        # robots are never worth building beyond what we can spend per minute
+        self.limits = Solver.robot_limits(blueprint)[:3] + (inf,)
+
+        # what building each robot adds to a state, i.e., one robot minus its costs
+        self.builds = []
+        for robot, costs in enumerate(blueprint):
+            gain = tuple(int(r == robot) for r in range(4))
+            self.builds.append((robot, costs, gain + tuple(-c for c in costs)))
+
+        self.stats = Counter()
+
+    def solve(self, time_limit: int) -> int:
+        # the frontier holds all distinct states at the start of a minute, as
+        # (ore, clay, obsidian, geode) robots followed by the same resources
+        frontier, best = [(1, 0, 0, 0, 0, 0, 0, 0)], 0
+        self.stats = Counter()
+
+        for t in range(time_limit, 0, -1):
+            successors = set()
+            for state in frontier:
+                rore, rcla, robs, rgeo, ore, cla, obs, geo = state
+
+                # [bound] we can at least wait until the end
+                best = max(best, geo + rgeo * t)
+
+                # [prune] not even a relaxed problem can beat the best state
+                if self.bnb.upper_bound(t, rcla, robs, rgeo, cla, obs, geo) <= best:
+                    self.stats["pruned"] += 1
+                    continue
+
+                self.stats["expanded"] += 1
+                successors.update(self.successors(t, state))
+
+            frontier = dominant(successors)
+            self.stats["dominated"] += len(successors) - len(frontier)
+
+            # [beam] only keep the most promising states, which is not exact
+            if self.width is not None and len(frontier) > self.width:
+                self.stats["dropped"] += len(frontier) - self.width
+                frontier = nlargest(
+                    self.width, frontier, key=lambda s: promise(t - 1, *s)
+                )
+
+        return max([best] + [s[GEO + 4] for s in frontier])
+
+    def successors(self, t: int, state: Tuple) -> List[Tuple]:
+        # all states after this minute, with t minutes left before it
+        _, _, _, _, ore, cla, obs, _ = state
+        waiting = tuple(map(add, state, (0, 0, 0, 0, *state[:4])))
+        options = [waiting]
+
+        for robot, (core, ccla, cobs, _), delta in self.builds:
+            affordable = ore >= core and cla >= ccla and obs >= cobs
+            if affordable and state[robot] < self.limits[robot]:
+                options.append(tuple(map(add, waiting, delta)))
+
+        # [prune] resources beyond what we can spend in the remaining time are
+        # worthless, so they are capped, which makes more states equal
+        caps = [limit * (t - 1) for limit in self.limits[:3]]
+        return [(*s[:4], *map(min, s[4:7], caps), s[7]) for s in options]
+
+
+def dominant(states: Iterable[Tuple]) -> List[Tuple]:
+    # drops every state with the same robots as another state,
+    # but no more resources of any kind in the inventory
+    groups = defaultdict(list)
+    for state in states:
+        groups[state[:4]].append(state[4:])
+
+    result = []
+    for rates, group in groups.items():
+        kept = []
+        for ore, cla, obs, geo in sorted(group, reverse=True):
+            for kore, kcla, kobs, kgeo in kept:
+                if kore >= ore and kcla >= cla and kobs >= obs and kgeo >= geo:
+                    break
+            else:
+                kept.append((ore, cla, obs, geo))
+        result.extend(rates + inventory for inventory in kept)
 
-@print_calls
-@print_durations(unit="ms")
-def part1(blueprints: List[Blueprint]):
-    results = Solver(blueprints).solve(24)
+    return result
+
+
+def promise(t: int, rore, rcla, robs, rgeo, ore, cla, obs, geo) -> Tuple:
+    # geodes, obsidian, clay and ore that we had after t more minutes of waiting
+    return geo + rgeo * t, obs + robs * t, cla + rcla * t, ore + rore * t
+
+
+def wait(missing: int, rate: int) -> int:
+    # minutes until a `missing` amount of resources is produced at `rate`
+    return 0 if missing <= 0 else -(-missing // rate)
+
+
+def solve_in_worker(
+    blueprint: Blueprint, time_limit: int, engine: str, width: int = None
+) -> Tuple[int, Counter]:
+    solver = Solver([blueprint], engine=engine, width=width)
+    return solver.solve_blueprint(blueprint, time_limit)
+
+
+@instrument
+def part1(
+    blueprints: List[Blueprint],
+    processes: int = 1,
+    engine: str = "bnb",
+    width: int = None,
+):
+    results = Solver(blueprints, processes, engine, width).solve(24)
     return sum(i * geo for i, geo in enumerate(results, 1))
 
 
-@print_calls
-@print_durations(unit="ms")
-def part2(blueprints):
-    results = Solver(blueprints[:3]).solve(32)
+@instrument
+def part2(blueprints, processes: int = 1, engine: str = "bnb", width: int = None):
+    results = Solver(blueprints[:3], processes, engine, width).solve(32)
     return prod(results)
 
 
 @collecting
 def load(data) -> Iterable[Blueprint]:
-    for line in data.split("\n"):
-        r0, r1, r2, r3, *_ = [ln.strip() for ln in line.split(": ")[1].split(".")]
-
-        pore = parse("Each ore robot costs {:d} ore", r0)
-        pcla = parse("Each clay robot costs {:d} ore", r1)
-        pobs = parse("Each obsidian robot costs {:d} ore and {:d} clay", r2)
-        pgeo = parse("Each geode robot costs {:d} ore and {:d} obsidian", r3)
-
-        ore = (pore[0], 0, 0, 0)
-        cla = (pcla[0], 0, 0, 0)
-        obs = (pobs[0], pobs[1], 0, 0)
-        geo = (pgeo[0], 0, pgeo[1], 0)
+    for _, pore, pcla, pobs1, pobs2, pgeo1, pgeo2 in BLUEPRINT.findall(data):
+        ore = (pore, 0, 0, 0)
+        cla = (pcla, 0, 0, 0)
+        obs = (pobs1, pobs2, 0, 0)
+        geo = (pgeo1, 0, pgeo2, 0)
 
         yield (ore, cla, obs, geo)
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=19)
+    data = puzzle_input(19)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 1144
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 19980
-    # puzzle.answer_b = ans2
+
+    # the exact breadth-by-minute search must agree with branch-and-bound
+    assert part1(load(data), engine="beam") == ans1
+    assert part2(load(data), engine="beam") == ans2
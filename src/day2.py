@@ -1,8 +1,10 @@
 # Advent of Code 2022, Day 2
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import collecting, print_calls, print_durations
+from funcy import collecting
+
+from inputs import puzzle_input
+from profiling import instrument
 
 ROCK, PAPER, SCISSORS = 1, 2, 3
 LOSE_X, DRAW_Y, WIN_Z = 1, 2, 3
@@ -21,8 +23,7 @@ MOVE_DRAW = {ROCK: ROCK, PAPER: PAPER, SCISSORS: SCISSORS}
 MOVE_WIN = {ROCK: PAPER, PAPER: SCISSORS, SCISSORS: ROCK}
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(data):
     total = 0
     for opponent, me in data:
@@ -31,8 +32,7 @@ def part1(data):
     return total
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(data):
     total = 0
     for opponent, outcome in data:
@@ -72,11 +72,9 @@ def move_for_outcome(outcome, opponent):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=2)
+    data = puzzle_input(2)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 9759
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 12429
-    # puzzle.answer_b = ans2
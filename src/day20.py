@@ -1,24 +1,47 @@
 # Advent of Code 2022, Day 20
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import first, lmap, print_calls, print_durations
+from bisect import bisect_left
+from itertools import accumulate, chain
+from math import isqrt
 
+import numpy as np
+from funcy import first, lmap
 
-@print_calls
-@print_durations(unit="ms")
-def part1(nums):
-    return solve(nums)
+from inputs import puzzle_input
+from profiling import instrument
 
 
-@print_calls
-@print_durations(unit="ms")
-def part2(nums, key=811589153):
+@instrument
+def part1(nums, engine="blocks"):
+    return solve(nums, engine=engine)
+
+
+@instrument
+def part2(nums, key=811589153, engine="blocks"):
     nums = [num * key for num in nums]
-    return solve(nums, nrepeat=10)
+    return solve(nums, nrepeat=10, engine=engine)
+
+
+def solve(nums, nrepeat=1, engine="blocks"):
+    # either the plain list, the block list, which is much faster on large
+    # inputs, or the array of positions, which has the smallest memory footprint
+    assert engine in ("list", "blocks", "positions")
+    mix = {"list": mix_list, "blocks": mix_blocks, "positions": mix_positions}
+    order = mix[engine](nums, nrepeat)
+
+    # find the index of the first zero, after mixing
+    zero = first(j for j, i in enumerate(order) if nums[i] == 0)
+
+    # the sum of numbers at the indices 1000, 2000, 3000 after mixing
+    size = len(nums)
+    n1000 = nums[order[(zero + 1000) % size]]
+    n2000 = nums[order[(zero + 2000) % size]]
+    n3000 = nums[order[(zero + 3000) % size]]
+    return n1000 + n2000 + n3000
 
 
-def solve(nums, nrepeat=1):
+def mix_list(nums, nrepeat=1):
     # add index to each number to make them unique
     nums = list(enumerate(nums))
     orgs = nums.copy()
@@ -33,14 +56,71 @@ def solve(nums, nrepeat=1):
             nums.pop(jold)
             nums.insert(jnew, (i, num))
 
-    # find the index of the first zero, after mixing
-    zero = first(i for i, (_, num) in enumerate(nums) if num == 0)
+    # the original indices, in mixed order
+    return [i for i, _ in nums]
+
+
+def mix_blocks(nums, nrepeat=1, block_size=None):
+    # the original indices are split into blocks of about sqrt(n) elements,
+    # so that we only search, remove and insert within one block, and only
+    # need the sizes of the blocks before it to get the global position
+    size = len(nums)
+    block_size = block_size or max(64, 4 * isqrt(size))
+    order = list(range(size))
+
+    for _ in range(nrepeat):
+        # rebalance the blocks once per round
+        blocks = [order[k : k + block_size] for k in range(0, size, block_size)]
+        sizes = list(map(len, blocks))
+        owner = [0] * size
+        for k, block in enumerate(blocks):
+            for i in block:
+                owner[i] = k
+
+        for i, num in enumerate(nums):
+            # locate the number and remove it from its block
+            k = owner[i]
+            block = blocks[k]
+            jblock = block.index(i)
+            del block[jblock]
+            sizes[k] -= 1
+
+            # the global index is the sizes of all blocks before plus the index
+            # within the block, the removal does not change the blocks before
+            ends = list(accumulate(sizes))
+            jold = ends[k] - sizes[k] + jblock
+
+            # find the block that contains the new index, where inserting at
+            # the end of a block is the same as at the start of the next one
+            jnew = (num + jold) % (size - 1)
+            k = min(bisect_left(ends, jnew), len(blocks) - 1)
+            blocks[k].insert(jnew - ends[k] + sizes[k], i)
+            sizes[k] += 1
+            owner[i] = k
+
+        order = list(chain.from_iterable(blocks))
+
+    return order
 
-    # the sum of numbers at the indices 1000, 2000, 3000 after mixing
-    n1000 = nums[(zero + 1000) % size][1]
-    n2000 = nums[(zero + 2000) % size][1]
-    n3000 = nums[(zero + 3000) % size][1]
-    return n1000 + n2000 + n3000
+
+def mix_positions(nums, nrepeat=1):
+    # the current position of each original index, where moving a number
+    # shifts all positions in between by one, towards its old position
+    size = len(nums)
+    positions = np.arange(size, dtype=np.int64)
+
+    for _ in range(nrepeat):
+        for i, num in enumerate(nums):
+            jold = int(positions[i])
+            jnew = (num + jold) % (size - 1)
+            if jnew > jold:
+                positions -= (positions > jold) & (positions <= jnew)
+            elif jnew < jold:
+                positions += (positions >= jnew) & (positions < jold)
+            positions[i] = jnew
+
+    # the original indices, in mixed order
+    return np.argsort(positions).tolist()
 
 
 def load(data):
@@ -48,12 +128,14 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=20)
+    data = puzzle_input(20)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 15297
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 2897373276210
-    # puzzle.answer_b = ans2
+
+    # mixing the positions must agree with mixing the blocks
+    assert part1(load(data), engine="positions") == ans1
+    assert part2(load(data), engine="positions") == ans2
@@ -4,25 +4,25 @@
 from collections import deque, namedtuple
 from operator import __add__, __mul__, __sub__, __truediv__
 
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
-from parse import parse
-from sympy import Integer, Symbol
-from sympy.solvers import solve
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
 
 Primitive = namedtuple("Primitive", ["name", "val"])
 Operation = namedtuple("Operation", ["name", "op", "a", "b"])
+NUMBER = Format("{:w}: {:d}")
+OPERATION = Format("{:w}: {:w} {} {:w}")
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(monkeys):
     return int(expand(monkeys, "root"))
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(monkeys, root="root", humn="humn"):
+    from sympy import Integer, Symbol, solve
+
     # make the human primitive a sympy Symbol object
     # and make other primitives into sympy Integer objects
     monkeys[humn] = Primitive(humn, Symbol(humn))
@@ -69,24 +69,21 @@ def expand(monkeys, target="root"):
 def load(data):
     operands = {"+": __add__, "-": __sub__, "*": __mul__, "/": __truediv__}
     monkeys = {}
-    for line in data.split("\n"):
-        name, val = line.split(": ")
-        if val.isdigit():
-            monkeys[name] = Primitive(name, int(val))
-        else:
-            a, op, b = parse("{} {} {}", val)
-            monkeys[name] = Operation(name, operands[op], a, b)
+    for name, val in NUMBER.findall(data, strict=False):
+        monkeys[name] = Primitive(name, val)
+    for name, a, op, b in OPERATION.findall(data, strict=False):
+        monkeys[name] = Operation(name, operands[op], a, b)
 
+    # each line is either a number or an operation
+    assert len(monkeys) == len(data.splitlines()), "some monkeys did not match"
     return monkeys
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=21)
+    data = puzzle_input(21)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 169525884255464
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 3247317268284
-    # puzzle.answer_b = ans2
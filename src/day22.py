@@ -2,16 +2,21 @@
 # (c) blu3r4y
 
 import re
-from dataclasses import dataclass, field
-from typing import Dict, List, Literal, Tuple
+from dataclasses import dataclass
+from typing import List
 
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
+import numpy as np
+
+from grid import Grid
+from inputs import puzzle_input
+from profiling import instrument
 
 RIGHT, LEFT, UP, DOWN = 1, -1, -1j, 1j
 TURN_RIGHT, TURN_LEFT = 1j, -1j
 
 SYMBOL_FREE, SYMBOL_WALL = ".", "#"
+VOID, FREE, WALL = 0, 1, 2
+TILES = {" ": VOID, SYMBOL_FREE: FREE, SYMBOL_WALL: WALL}
 SYMBOL_RIGHT, SYMBOL_LEFT = "R", "L"
 DIRECTION_FACTOR = {RIGHT: 0, DOWN: 1, LEFT: 2, UP: 3}
 
@@ -50,10 +55,8 @@ EDGES = {
 
 @dataclass
 class Cube:
-    # maps coordinates to symbols
-    coords: Dict[complex, Literal[".", "#"]]
-    # maps coordinates to the (x, y) face they belong to
-    faces: Dict[complex, Tuple[int, int]] = field(init=False)
+    # tiles of the map, with a void border, so that (y, x) are 1-based
+    grid: Grid
     # movement sequence (turns and steps)
     sequence: List[complex | int]
     # height of the grid
@@ -65,33 +68,22 @@ class Cube:
     # starting point in the grid
     start: complex
 
-    def __post_init__(self):
-        self.faces = self._assign_faces()
-
-    def _assign_faces(self):
-        faces = {}
-        for y in range(1, self.height + 1):
-            yindex = (y - 1) // self.tile_size
-            for x in range(1, self.width + 1):
-                xindex = (x - 1) // self.tile_size
-
-                # map coordinates to the face they belong to
-                if (pos := x + y * 1j) in self.coords:
-                    face = (xindex, yindex)
-                    faces[pos] = face
+    def tile(self, pos: complex) -> int:
+        return self.grid[int(pos.imag), int(pos.real)]
 
-        return faces
+    def face(self, pos: complex):
+        # the (x, y) face that the coordinates belong to
+        x, y = int(pos.real) - 1, int(pos.imag) - 1
+        return x // self.tile_size, y // self.tile_size
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(cube: Cube):
     curr, dir = walk(cube, wrap_func=wrap2d)
     return int(1000 * curr.imag + 4 * curr.real + DIRECTION_FACTOR[dir])
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(cube: Cube):
 
     curr, dir = walk(cube, wrap_func=wrap3d)
@@ -99,8 +91,10 @@ def part2(cube: Cube):
 
 
 def walk(cube: Cube, wrap_func: callable):
-    # start position facing right
-    pos, dir = cube.start, RIGHT
+    grid, tiles = cube.grid, cube.grid.buffer
+
+    # start position facing right, we walk on packed indices
+    pos, dir = pack(grid, cube.start), RIGHT
 
     for move in cube.sequence:
         # turn right or left
@@ -109,26 +103,36 @@ def walk(cube: Cube, wrap_func: callable):
             continue
 
         # move forward step-by-step
-        backup = pos, dir
+        backup, step = (pos, dir), pack(grid, dir)
         for _ in range(move):
-            pos += dir
+            pos += step
 
             # possibly wrap around
-            if pos not in cube.coords:
-                pos, dir = wrap_func(pos, dir, cube)
+            if tiles[pos] == VOID:
+                pos, dir = wrap_func(unpack(grid, pos), dir, cube)
+                pos, step = pack(grid, pos), pack(grid, dir)
 
             # revert move and abort if we hit a wall
-            if cube.coords[pos] == SYMBOL_WALL:
+            if tiles[pos] == WALL:
                 pos, dir = backup
                 break
 
             backup = pos, dir
 
-    return pos, dir
+    return unpack(grid, pos), dir
+
+
+def pack(grid: Grid, pos: complex) -> int:
+    return grid.pack(int(pos.imag), int(pos.real))
+
+
+def unpack(grid: Grid, pos: int) -> complex:
+    y, x = grid.unpack(pos)
+    return x + y * 1j
 
 
 def wrap2d(pos: complex, dir: complex, cube: Cube):
-    assert pos not in cube.coords
+    assert cube.tile(pos) == VOID
 
     # wrap around in direction
     if dir == RIGHT:
@@ -141,13 +145,13 @@ def wrap2d(pos: complex, dir: complex, cube: Cube):
         pos = pos.real + 1j
 
     # line search next valid point
-    while pos not in cube.coords:
+    while cube.tile(pos) == VOID:
         pos += dir
     return pos, dir
 
 
 def wrap3d(pos: complex, dir: complex, cube: Cube):
-    assert pos not in cube.coords
+    assert cube.tile(pos) == VOID
 
     # revert last move, find face, and relative position in face
     pos = pos - dir
@@ -157,7 +161,7 @@ def wrap3d(pos: complex, dir: complex, cube: Cube):
     )
 
     # which face shall we wrap around to next?
-    nface, ndir, nflip = EDGES[cube.faces[pos], dir]
+    nface, ndir, nflip = EDGES[cube.face(pos), dir]
 
     # possibly flip our relative coordinates
     if nflip:
@@ -194,21 +198,12 @@ def wrap3d(pos: complex, dir: complex, cube: Cube):
 def load(data, tile_size=50):
     card, phrase = data.split("\n\n")
 
-    # prepare map processing
-    card = card.split("\n")
-    height, width = len(card), max(map(len, card))
-    width = max(map(len, card))
-    coords, start = {}, None
-
-    # read map coordinates
-    for y, row in enumerate(card, 1):
-        row = row.ljust(width, " ")
-        for x, symbol in enumerate(row, 1):
-            if symbol == SYMBOL_WALL or symbol == SYMBOL_FREE:
-                pos = x + y * 1j
-                coords[pos] = symbol
-                if start is None:
-                    start = pos
+    # read the map, with a void border around it
+    grid = Grid.parse(card, mapping=TILES).pad(1, fill=VOID)
+    height, width = grid.height - 2, grid.width - 2
+
+    # start at the first tile in the top row
+    start = int(np.flatnonzero(grid.row(1) != VOID)[0]) + 1j
 
     # read and transform move sequence
     sequence = []
@@ -222,7 +217,7 @@ def load(data, tile_size=50):
             sequence.append(int(ch))
 
     return Cube(
-        coords=coords,
+        grid=grid,
         sequence=sequence,
         height=height,
         width=width,
@@ -232,12 +227,10 @@ def load(data, tile_size=50):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=22)
+    data = puzzle_input(22)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 159034
-    puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 147245
-    puzzle.answer_b = ans2
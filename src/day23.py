@@ -1,104 +1,114 @@
 # Advent of Code 2022, Day 23
 # (c) blu3r4y
 
-from collections import defaultdict
-from typing import Set
+from typing import Tuple
 
-from aocd.models import Puzzle
-from funcy import count, print_calls, print_durations
+import numpy as np
+from funcy import count
 
-N, NE, E, SE, S, SW, W, NW = -1j, 1 - 1j, 1, 1 + 1j, 1j, 1j - 1, -1, -1 - 1j
+from grid import Grid
+from inputs import puzzle_input
+from profiling import instrument
+
+N, S, W, E = (-1, 0), (1, 0), (0, -1), (0, 1)
+NE, NW, SE, SW = (-1, 1), (-1, -1), (1, 1), (1, -1)
 DIRECTIONS = [N, NE, E, SE, S, SW, W, NW]
 
+# the three neighbors that must be free to propose a move in a direction
+CONSIDER = {N: (N, NE, NW), S: (S, SE, SW), W: (W, NW, SW), E: (E, NE, SE)}
+
+# elves that propose the same tile must come from opposite directions
+OPPOSITE = {N: S, S: N, W: E, E: W}
 
-@print_calls
-@print_durations(unit="ms")
-def part1(elves: Set[complex]):
+
+@instrument
+def part1(elves: Grid):
     # simulate a maximum of 10 rounds
-    simulate(elves, round_limit=10)
+    elves, _ = simulate(elves, round_limit=10)
 
     # bounding box around elves
-    xs, ys = [int(e.real) for e in elves], [int(e.imag) for e in elves]
-    xmin, xmax = min(xs), max(xs)
-    ymin, ymax = min(ys), max(ys)
+    ys, xs = np.nonzero(elves.cells)
+    area = (ys.max() - ys.min() + 1) * (xs.max() - xs.min() + 1)
 
     # count free cells
-    nfree = (xmax - xmin + 1) * (ymax - ymin + 1) - len(elves)
-    return nfree
+    return int(area - len(ys))
 
 
-@print_calls
-@print_durations(unit="ms")
-def part2(elves: Set[complex]):
+@instrument
+def part2(elves: Grid):
     # round number until no more elves can move
-    return simulate(elves, round_limit=float("inf"))
+    _, rnd = simulate(elves, round_limit=float("inf"))
+    return rnd
 
 
-def simulate(elves: Set[complex], round_limit: int | float):
+def simulate(elves: Grid, round_limit: int | float) -> Tuple[Grid, int]:
     # consideration and proposal order
-    propose, index = [N, S, W, E], 0
-    consider = [
-        lambda e: e + N not in elves and e + NE not in elves and e + NW not in elves,
-        lambda e: e + S not in elves and e + SE not in elves and e + SW not in elves,
-        lambda e: e + W not in elves and e + NW not in elves and e + SW not in elves,
-        lambda e: e + E not in elves and e + NE not in elves and e + SE not in elves,
-    ]
+    propose = [N, S, W, E]
 
     for rnd in count():
         if rnd >= round_limit:
-            return rnd + 1
-
-        moves, noverlaps = [], defaultdict(int)
-        for elf in elves:
-
-            # skip if no elves are around
-            neighbors = (elf + d for d in DIRECTIONS)
-            if all(n not in elves for n in neighbors):
+            return elves, rnd + 1
+
+        # keep a free border of at least one cell around all elves
+        elves = grow(elves)
+
+        # which neighbors are occupied, for all elves at once
+        occupied = {d: elves.shifted(*d) for d in DIRECTIONS}
+        free = {
+            d: ~(occupied[a] | occupied[b] | occupied[c])
+            for d, (a, b, c) in CONSIDER.items()
+        }
+
+        # skip if no elves are around
+        waiting = elves.interior() & ~np.logical_or.reduce(list(occupied.values()))
+        remaining = elves.interior() & ~waiting
+
+        # make move proposals, the first free direction wins
+        proposals = {}
+        for d in propose:
+            proposals[d] = remaining & free[d]
+            remaining &= ~proposals[d]
+
+        # the target tiles of all proposals
+        targets = {d: np.zeros_like(elves.cells) for d in propose}
+        for d in propose:
+            Grid(targets[d]).shifted(*d)[:] = proposals[d]
+
+        # perform moves that do not overlap
+        moved, nmoves = elves.copy(), 0
+        for d in propose:
+            dest = targets[d] & ~targets[OPPOSITE[d]]
+            if not dest.any():
                 continue
+            nmoves += int(dest.sum())
+            moved.cells |= dest
+            back = Grid(dest).shifted(*d)
+            moved.interior()[back] = False
 
-            # make move proposal
-            move = None
-            for rnd in range(index, index + 4):
-                rnd = rnd % 4
-                if consider[rnd](elf):
-                    move = propose[rnd]
-                    break
-
-            if move is not None:
-                moves.append((elf, move))
-                noverlaps[elf + move] += 1
-
-        # no more elves to move or round limit reached
-        if len(moves) == 0:
-            return rnd + 1
-
-        # perform moves
-        for elf, move in moves:
-            if noverlaps[elf + move] > 1:
-                continue
-            elves.remove(elf)
-            elves.add(elf + move)
+        # no more elves to move
+        if nmoves == 0:
+            return elves, rnd + 1
 
         # rotate consideration order
-        index = (index + 1) % 4
+        elves, propose = moved, propose[1:] + propose[:1]
 
 
-def load(data) -> Set[complex]:
-    elves = set()
-    for y, row in enumerate(data.split("\n")):
-        for x, cell in enumerate(row):
-            if cell == "#":
-                elves.add(x + y * 1j)
+def grow(elves: Grid, margin=10) -> Grid:
+    cells = elves.cells
+    if cells[0].any() or cells[-1].any() or cells[:, 0].any() or cells[:, -1].any():
+        return elves.pad(margin, fill=False)
     return elves
 
 
+def load(data) -> Grid:
+    return Grid.parse(data, mapping={".": False, "#": True}, dtype=bool)
+
+
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=23)
+    data = puzzle_input(23)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 4049
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 1021
-    # puzzle.answer_b = ans2
@@ -1,34 +1,37 @@
 # Advent of Code 2022, Day 24
 # (c) blu3r4y
 
-from collections import defaultdict
-from functools import cache
+from math import lcm
 from queue import PriorityQueue
-from typing import Dict, Iterable, List, NamedTuple
+from typing import Iterable, NamedTuple
 
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
+import numpy as np
 
-UP, DOWN, LEFT, RIGHT = -1j, 1j, -1, 1
+from grid import Grid
+from inputs import puzzle_input
+from memo import memoize
+from profiling import instrument
 
-Blizzards = Dict[complex, List[complex]]
-State = NamedTuple("State", [("pos", complex), ("steps", int)])
+# blizzard symbols and their (axis, direction) of movement
+BLIZZARDS = {"^": (0, -1), "v": (0, 1), "<": (1, -1), ">": (1, 1)}
+
+State = NamedTuple("State", [("pos", int), ("steps", int)])
 
 
 class PuzzleSolver:
-    def __init__(
-        self,
-        blizzards: Blizzards,
-        start: complex,
-        goal: complex,
-        width: int,
-        height: int,
-    ):
-        self.blizzards = blizzards
-        self.start = start
-        self.goal = goal
-        self.width = width
-        self.height = height
+    def __init__(self, valley: Grid):
+        # the symbols of the valley, without the surrounding walls
+        self.valley = valley
+        self.width = valley.width
+        self.height = valley.height
+
+        # positions are packed indices into the valley with one extra row on
+        # top and bottom, i.e., with the start and goal in the corners
+        self.start = 0
+        self.goal = (self.height + 2) * self.width - 1
+
+        # blizzards are back at their initial positions after this many minutes
+        self.period = lcm(self.width, self.height)
 
     def solve(self, backwards: bool = False):
         # shortest path to goal
@@ -69,89 +72,77 @@ class PuzzleSolver:
 
     def estimate_remaining_steps(self, state: State) -> int:
         # manhattan distance from pos to goal
-        a, b = self.goal, state.pos
-        return int(abs(a.imag - b.imag) + abs(a.real - b.real))
+        ay, ax = divmod(self.goal, self.width)
+        by, bx = divmod(state.pos, self.width)
+        return abs(ay - by) + abs(ax - bx)
 
     def successor_states(self, state: State) -> Iterable[State]:
         tnext = state.steps + 1
-        blizzards = self.blizzards_map(tnext)
-
-        for dir in [DOWN, RIGHT, LEFT, UP]:
-            nxt = state.pos + dir
-
+        blocked = self.blizzards_map(tnext % self.period).buffer
+        w, x = self.width, state.pos % self.width
+
+        for nxt in [
+            state.pos + w,  # down
+            state.pos + 1 if x < w - 1 else None,  # right
+            state.pos - 1 if x > 0 else None,  # left
+            state.pos - w,  # up
+        ]:
             # already at the goal?
             if nxt == self.goal:
                 yield State(nxt, tnext)
                 return
 
-            # avoid blizzards and out of bounds moves
-            if (
-                nxt in blizzards
-                or (nxt.real < 0 or nxt.real > self.width - 1)
-                or (nxt.imag < 0 or nxt.imag > self.height - 1)
-            ):
+            # avoid blizzards, walls and out of bounds moves
+            if nxt is None or nxt < 0 or nxt >= len(blocked) or blocked[nxt]:
                 continue
 
             yield State(nxt, tnext)
 
         # is it safe to stay here?
-        if state.pos not in blizzards:
+        if not blocked[state.pos]:
             yield State(state.pos, tnext)
 
-    @cache
-    def blizzards_map(self, t) -> Blizzards:
-        blizzards = defaultdict(list)
+    @memoize(budget="512M")
+    def blizzards_map(self, t) -> Grid:
+        # walls everywhere in the extra rows, except for start and goal
+        blocked = Grid.full(self.height + 2, self.width, fill=True, dtype=bool)
+        blocked.flat[[self.start, self.goal]] = False
 
-        for pos, dirs in self.blizzards.items():
-            for dir in dirs:
-                npos = complex(
-                    real=(pos.real + dir.real * t) % self.width,
-                    imag=(pos.imag + dir.imag * t) % self.height,
-                )
-                blizzards[npos].append(dir)
+        # blizzards move in straight lines and wrap around,
+        # so their positions at any time step are just rolled
+        inner = blocked[1:-1]
+        inner[:] = False
+        for symbol, (axis, dir) in BLIZZARDS.items():
+            inner |= np.roll(self.valley.cells == ord(symbol), dir * t, axis=axis)
 
         # the blizzard map can be precomputed for each time step
-        # and memoized because it will never change for a given time step
-        return blizzards
+        # and memoized because it will never change for a given time step,
+        # and there are at most `period` different ones
+        return blocked
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(solver: PuzzleSolver):
     return solver.solve()
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(solver: PuzzleSolver):
     return solver.solve(backwards=True)
 
 
 def load(data) -> PuzzleSolver:
-    blizzards = defaultdict(list)
+    # strip the walls, we assume start and end positions in the corners
     lines = data.splitlines()
-    width, height = len(lines[0]) - 2, len(lines) - 2
-
-    # parse the blizzard positions
-    mapping = {"^": UP, "v": DOWN, "<": LEFT, ">": RIGHT}
-    for y, line in enumerate(lines[1:-1]):
-        for x, cell in enumerate(line[1:-1]):
-            if cell != ".":
-                blizzards[x + y * 1j].append(mapping[cell])
-
-    # assume start and end positions in the corners
-    start, goal = 0 - 1j, (width - 1) + height * 1j
-
-    return PuzzleSolver(blizzards, start, goal, width, height)
+    valley = "\n".join(line[1:-1] for line in lines[1:-1])
+    return PuzzleSolver(Grid.parse(valley))
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=24)
+    data = puzzle_input(24)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 262
-    # puzzle.answer_a = ans1
 
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 785
-    # puzzle.answer_b = ans2
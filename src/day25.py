@@ -1,12 +1,11 @@
 # Advent of Code 2022, Day 25
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
+from inputs import puzzle_input
+from profiling import instrument
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(nums):
     return dec2snafu(sum(map(snafu2dec, nums)))
 
@@ -57,8 +56,7 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=25)
+    data = puzzle_input(25)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == "2-1=10=1=1==2-1=-221"
-    # puzzle.answer_a = ans1
@@ -1,12 +1,13 @@
 # Advent of Code 2022, Day 3
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import first, partition, print_calls, print_durations
+from funcy import first, partition
 
+from inputs import puzzle_input
+from profiling import instrument
 
-@print_calls
-@print_durations(unit="ms")
+
+@instrument
 def part1(rucksacks):
     total = 0
     for sack in rucksacks:
@@ -19,8 +20,7 @@ def part1(rucksacks):
     return total
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(rucksacks):
     total = 0
     for a, b, c in partition(3, rucksacks):
@@ -46,11 +46,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=3)
+    data = puzzle_input(3)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 8109
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 2738
-    # puzzle.answer_b = ans2
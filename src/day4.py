@@ -1,13 +1,14 @@
 # Advent of Code 2022, Day 4
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import collecting, print_calls, print_durations
-from parse import parse
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
 
+PAIRS = Format("{:d}-{:d},{:d}-{:d}")
 
-@print_calls
-@print_durations(unit="ms")
+
+@instrument
 def part1(pairs):
     count = 0
     for a1, a2, b1, b2 in pairs:
@@ -18,8 +19,7 @@ def part1(pairs):
     return count
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(pairs):
     count = 0
     for a1, a2, b1, b2 in pairs:
@@ -30,18 +30,14 @@ def part2(pairs):
     return count
 
 
-@collecting
 def load(data):
-    for line in data.split("\n"):
-        yield parse("{:d}-{:d},{:d}-{:d}", line).fixed
+    return PAIRS.findall(data)
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=4)
+    data = puzzle_input(4)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 413
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 806
-    # puzzle.answer_b = ans2
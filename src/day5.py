@@ -3,11 +3,12 @@
 
 from collections import deque, namedtuple
 
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
-from parse import parse
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
 
-Instruction = namedtuple("Ins", ["n", "start", "end"])
+Instruction = namedtuple("Instruction", ["n", "start", "end"])
+MOVE = Format("move {:d} from {:d} to {:d}")
 
 
 def solve(data, reverse=False):
@@ -25,14 +26,12 @@ def solve(data, reverse=False):
     return "".join([crates[k][-1] for k in crates.keys()])
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(data):
     return solve(data)
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(data):
     return solve(data, reverse=True)
 
@@ -52,20 +51,16 @@ def load(data):
                 crates[ci + 1].insert(0, item)
 
     # parse move instructions
-    instructions = []
-    for line in lines[nheight + 2 :]:
-        ins = Instruction(*parse("move {:d} from {:d} to {:d}", line).fixed)
-        instructions.append(ins)
+    moves = "\n".join(lines[nheight + 2 :])
+    instructions = [Instruction(*m) for m in MOVE.findall(moves)]
 
     return crates, instructions
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=5)
+    data = puzzle_input(5)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == "BWNCQRMDB"
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == "NHWZCBNBF"
-    # puzzle.answer_b = ans2
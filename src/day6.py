@@ -1,8 +1,10 @@
 # Advent of Code 2022, Day 6
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import partition, print_calls, print_durations
+from funcy import partition
+
+from inputs import puzzle_input
+from profiling import instrument
 
 
 def solve(data, size):
@@ -13,14 +15,12 @@ def solve(data, size):
             return data.index(part) + size
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(data):
     return solve(data, 4)
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(data):
     return solve(data, 14)
 
@@ -30,11 +30,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=6)
+    data = puzzle_input(6)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 1080
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 3645
-    # puzzle.answer_b = ans2
@@ -1,9 +1,11 @@
 # Advent of Code 2022, Day 7
 # (c) blu3r4y
 
-from aocd.models import Puzzle
-from funcy import print_calls, print_durations
-from parse import parse
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
+
+CD, DIR, FILE = Format("$ cd {}"), Format("dir {}"), Format("{:d} {}")
 
 
 class Node:
@@ -51,8 +53,7 @@ class Node:
         return f"{nodetype}({self.name}, size={self.size}, dirsize={self.dirsize()} childs={self.childs})"
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(root, max_size=100_000):
     total = 0
     for dir in root.get_all_dirs():
@@ -63,8 +64,7 @@ def part1(root, max_size=100_000):
     return total
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(root, disk_size=70_000_000, update_size=30_000_000):
     free_space = disk_size - root.dirsize()
     candidates = []
@@ -86,7 +86,7 @@ def load(data):
 
         # perform cd instruction
         if line.startswith("$ cd"):
-            path = parse("$ cd {}", line)[0]
+            path = CD.match(line)[0]
             pwd = pwd.cd(path)
             i += 1
 
@@ -96,10 +96,10 @@ def load(data):
             while i < len(lines) and not lines[i].startswith("$"):
                 line = lines[i]
                 if line.startswith("dir"):
-                    path = parse("dir {}", line)[0]
+                    path = DIR.match(line)[0]
                     pwd.cd(path)
                 else:
-                    size, file = parse("{:d} {}", line).fixed
+                    size, file = FILE.match(line)
                     pwd.touch(file, size)
                 i += 1
 
@@ -108,11 +108,9 @@ def load(data):
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=7)
+    data = puzzle_input(7)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 1723892
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
-    # puzzle.answer_b = ans2
+    ans2 = part2(load(data))
     assert ans2 == 8474158
@@ -1,84 +1,51 @@
 # Advent of Code 2022, Day 8
 # (c) blu3r4y
 
-from collections import defaultdict
-from typing import Literal, Tuple, get_args
-
 import numpy as np
-from aocd.models import Puzzle
-from funcy import ilen, print_calls, print_durations
-
-Orientation = Literal["top", "left", "bot", "right"]
 
+from grid import Grid
+from inputs import puzzle_input
+from profiling import instrument
 
-@print_calls
-@print_durations(unit="ms")
-def part1(grid):
-    visible = set()
-    los = line_of_sight_skyline
 
-    # we stand on the left and right edge, looking 'inward'
-    for row in range(grid.shape[0]):
-        visible.update(visible_trees_from(grid, (row, 0), "left", los))
-        visible.update(visible_trees_from(grid, (row, grid.shape[1] - 1), "right", los))
+@instrument
+def part1(grid: Grid):
+    visible = np.zeros(grid.shape, dtype=bool)
 
-    # we stand on the top and bot edge, looking 'inward'
-    for col in range(grid.shape[1]):
-        visible.update(visible_trees_from(grid, (0, col), "top", los))
-        visible.update(visible_trees_from(grid, (grid.shape[0] - 1, col), "bot", los))
+    # we stand on every edge, looking 'inward', i.e., along the rows and
+    # columns of the grid, both forward and reversed (as views, not copies)
+    for trees, seen in views(grid.cells, visible):
+        # a tree is visible if it is higher than all trees before it
+        highest = np.maximum.accumulate(trees, axis=1)
+        seen[:, 0] = True
+        seen[:, 1:] |= trees[:, 1:] > highest[:, :-1]
 
-    return len(visible)
+    return int(visible.sum())
 
 
-@print_calls
-@print_durations(unit="ms")
-def part2(grid):
-    scores = defaultdict(lambda: 1)
-    los = line_of_sight_treehouse
+@instrument
+def part2(grid: Grid):
+    best = 0
 
     # we stand at every possible position and look 'outwards'
-    for row in range(grid.shape[0]):
-        for col in range(grid.shape[1]):
-            for orient in get_args(Orientation):
-                visible_trees = visible_trees_from(grid, (row, col), orient, los)
-                viewing_distance = ilen(visible_trees)
-                scores[(row, col)] *= viewing_distance
+    for y in range(grid.height):
+        row = grid.row(y)
+        for x in range(grid.width):
+            col, score = grid.col(x), 1
+            for line in (row[x:], row[x::-1], col[y:], col[y::-1]):
+                score *= len(line_of_sight_treehouse(line))
+            best = max(best, score)
 
     # best scenic score
-    return max(scores.values())
-
-
-def visible_trees_from(grid, start: Tuple[int, int], orient: Orientation, los_func):
-    x, y = start
-
-    if orient == "top":
-        visible = los_func(grid[x:, y])
-        return ((vis, y) for vis in visible)
-    elif orient == "left":
-        visible = los_func(grid[x, y:])
-        return ((x, vis) for vis in visible)
-    elif orient == "bot":
-        visible = los_func(grid[x::-1, y])
-        return ((grid.shape[1] - 1 - vis, y) for vis in visible)
-    elif orient == "right":
-        visible = los_func(grid[x, y::-1])
-        return ((x, grid.shape[0] - 1 - vis) for vis in visible)
-
+    return best
 
-def line_of_sight_skyline(arr):
-    """
-    Line of sight with the "skyline" method from part 1, i.e., we can see
-    everything that is not occluding our POV until we can't see any more.
-    The first item in the array will always be seen.
-    """
-    highest, visible = -1, []
-
-    for i, t in enumerate(arr):
-        if t > highest:
-            visible.append(i)
-        highest = max(t, highest)
 
-    return visible
+def views(*arrays):
+    # looking from the left, right, top and bottom edge
+    yield arrays
+    yield tuple(a[:, ::-1] for a in arrays)
+    yield tuple(a.T for a in arrays)
+    yield tuple(a.T[:, ::-1] for a in arrays)
 
 
 def line_of_sight_treehouse(arr):
@@ -104,16 +71,14 @@ def line_of_sight_treehouse(arr):
     return visible
 
 
-def load(data):
-    return np.array([list(map(int, line)) for line in data.split("\n")])
+def load(data) -> Grid:
+    return Grid.parse(data, mapping=int)
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=8)
+    data = puzzle_input(8)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 1763
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 671160
-    # puzzle.answer_b = ans2
@@ -4,21 +4,21 @@
 from collections import namedtuple
 
 import numpy as np
-from aocd.models import Puzzle
-from funcy import collecting, print_calls, print_durations
-from parse import parse
+
+from inputs import puzzle_input
+from parsing import Format
+from profiling import instrument
 
 Move = namedtuple("Move", ["dir", "len"])
+MOVE = Format("{:w} {:d}")
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part1(moves):
     return solve(moves, nknots=2)
 
 
-@print_calls
-@print_durations(unit="ms")
+@instrument
 def part2(moves):
     return solve(moves, nknots=10)
 
@@ -69,18 +69,14 @@ def advance(pos, move):
         raise ValueError(f"invalid direction: {move.dir}")
 
 
-@collecting
 def load(data):
-    for line in data.split("\n"):
-        yield Move(*parse("{} {:d}", line).fixed)
+    return [Move(*m) for m in MOVE.findall(data)]
 
 
 if __name__ == "__main__":
-    puzzle = Puzzle(year=2022, day=9)
+    data = puzzle_input(9)
 
-    ans1 = part1(load(puzzle.input_data))
+    ans1 = part1(load(data))
     assert ans1 == 6081
-    # puzzle.answer_a = ans1
-    ans2 = part2(load(puzzle.input_data))
+    ans2 = part2(load(data))
     assert ans2 == 2487
-    # puzzle.answer_b = ans2
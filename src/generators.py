@@ -0,0 +1,543 @@
+# Advent of Code 2022, Synthetic Input Generators
+# (c) blu3r4y
+
+import argparse
+import hashlib
+import inspect
+import random
+import string
+import sys
+
+from day25 import dec2snafu
+
+# maps days to their generator functions
+GENERATORS = {}
+
+
+def generator(day):
+    def register(func):
+        GENERATORS[day] = func
+        return func
+
+    return register
+
+
+def generate(day: int, scale: float = 1, seed: int = 0) -> str:
+    # a scale of 1 yields inputs of roughly the size of the real ones,
+    # and the same day, scale and seed always yield the same input,
+    # no matter if the scale is given as an int or a float
+    scale = float(scale)
+    rng = random.Random(f"{day}:{scale}:{seed}")
+    return GENERATORS[day](rng, scale)
+
+
+def fingerprint(day: int) -> str:
+    # changes whenever the generator of that day changes
+    source = inspect.getsource(GENERATORS[day])
+    return hashlib.sha256(source.encode()).hexdigest()[:8]
+
+
+def sized(n, scale):
+    return max(1, round(n * scale))
+
+
+def side(n, scale, dims=2):
+    # side length of a square (or cube) whose area grows with the scale
+    return max(1, round(n * scale ** (1 / dims)))
+
+
+@generator(1)
+def calories(rng, scale):
+    elves = []
+    for _ in range(sized(250, scale)):
+        items = [rng.randint(1000, 60000) for _ in range(rng.randint(1, 15))]
+        elves.append("\n".join(map(str, items)))
+
+    return "\n\n".join(elves)
+
+
+@generator(2)
+def strategy_guide(rng, scale):
+    lines = [
+        f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(sized(2500, scale))
+    ]
+    return "\n".join(lines)
+
+
+@generator(3)
+def rucksacks(rng, scale):
+    letters, lines = string.ascii_letters, []
+
+    for _ in range(sized(100, scale)):
+        badge = rng.choice(letters)
+        others = rng.sample([c for c in letters if c != badge], 51)
+
+        # every sack of a group gets its own letters, so only the badge is shared
+        for i in range(3):
+            chunk = others[i * 17 : (i + 1) * 17]
+            shared, left, right = chunk[0], chunk[1:9], chunk[9:17]
+
+            # both compartments have the same size and exactly one shared item
+            k = rng.randint(8, 24)
+            a = [shared, badge] + rng.choices(left, k=k - 2)
+            b = [shared] + rng.choices(right, k=k - 1)
+            rng.shuffle(a)
+            rng.shuffle(b)
+            lines.append("".join(a + b))
+
+    return "\n".join(lines)
+
+
+@generator(4)
+def section_pairs(rng, scale):
+    lines = []
+    for _ in range(sized(1000, scale)):
+        a1, b1 = rng.randint(1, 99), rng.randint(1, 99)
+        a2, b2 = rng.randint(a1, 99), rng.randint(b1, 99)
+        lines.append(f"{a1}-{a2},{b1}-{b2}")
+
+    return "\n".join(lines)
+
+
+@generator(5)
+def supply_stacks(rng, scale, nstacks=9):
+    stacks = [
+        rng.choices(string.ascii_uppercase, k=rng.randint(1, 8)) for _ in range(nstacks)
+    ]
+    height = max(map(len, stacks))
+
+    # draw the stacks from top to bottom
+    lines = []
+    for level in reversed(range(height)):
+        cells = [f"[{s[level]}]" if len(s) > level else "   " for s in stacks]
+        lines.append(" ".join(cells))
+    lines.append(" ".join(f" {i} " for i in range(1, nstacks + 1)))
+    lines.append("")
+
+    # never empty a stack, so that every stack has a top crate in the end
+    counts = [len(s) for s in stacks]
+    for _ in range(sized(500, scale)):
+        start = rng.choice([i for i, c in enumerate(counts) if c > 1])
+        end = rng.choice([i for i in range(nstacks) if i != start])
+        n = rng.randint(1, counts[start] - 1)
+        counts[start] -= n
+        counts[end] += n
+        lines.append(f"move {n} from {start + 1} to {end + 1}")
+
+    return "\n".join(lines)
+
+
+@generator(6)
+def datastream(rng, scale):
+    # only three distinct letters, so that both markers are at the very end
+    noise = rng.choices("abc", k=sized(4096, scale))
+    marker = rng.sample(string.ascii_lowercase[3:], 14)
+    return "".join(noise + marker)
+
+
+@generator(7)
+def filesystem(rng, scale):
+    # random tree of directories, each with a couple of files
+    ndirs = sized(200, scale)
+    childs = [[] for _ in range(ndirs)]
+    for i in range(1, ndirs):
+        childs[rng.randrange(i)].append(i)
+
+    def names(n):
+        found = set()
+        while len(found) < n:
+            found.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 8))))
+        return list(found)
+
+    lines = ["$ cd /"]
+
+    def walk(node):
+        nfiles = rng.randint(0, 5)
+        ndirs = len(childs[node])
+        entries = names(ndirs + nfiles)
+        dirs, files = entries[:ndirs], entries[ndirs:]
+
+        lines.append("$ ls")
+        lines.extend(f"dir {name}" for name in dirs)
+        lines.extend(f"{rng.randint(1000, 300_000)} {name}" for name in files)
+
+        for name, child in zip(dirs, childs[node]):
+            lines.append(f"$ cd {name}")
+            walk(child)
+            lines.append("$ cd ..")
+
+    walk(0)
+    return "\n".join(lines)
+
+
+@generator(8)
+def tree_heights(rng, scale):
+    n = side(99, scale)
+    return "\n".join("".join(rng.choices("0123456789", k=n)) for _ in range(n))
+
+
+@generator(9)
+def rope_moves(rng, scale):
+    lines = [
+        f"{rng.choice('RLUD')} {rng.randint(1, 20)}" for _ in range(sized(2000, scale))
+    ]
+    return "\n".join(lines)
+
+
+@generator(10)
+def cpu_instructions(rng, scale):
+    # the crt of part 2 needs at least 240 cycles
+    lines, cycles = [], 0
+    while cycles < max(240, sized(240, scale)):
+        if rng.random() < 0.4:
+            lines.append("noop")
+            cycles += 1
+        else:
+            # zero is avoided, as it is indistinguishable from a noop when parsed
+            lines.append(f"addx {rng.choice([-1, 1]) * rng.randint(1, 20)}")
+            cycles += 2
+
+    return "\n".join(lines)
+
+
+@generator(11)
+def monkeys(rng, scale, nmonkeys=8):
+    primes = rng.sample([2, 3, 5, 7, 11, 13, 17, 19, 23], nmonkeys)
+
+    blocks = []
+    for no in range(nmonkeys):
+        items = [rng.randint(50, 99) for _ in range(sized(rng.randint(1, 8), scale))]
+        # squaring is avoided, as the worry levels of part 1 would explode
+        op = rng.choice([f"* {rng.randint(2, 19)}", f"+ {rng.randint(1, 8)}"])
+        iftrue, iffalse = rng.sample([m for m in range(nmonkeys) if m != no], 2)
+        blocks.append(
+            f"Monkey {no}:\n"
+            f"  Starting items: {', '.join(map(str, items))}\n"
+            f"  Operation: new = old {op}\n"
+            f"  Test: divisible by {primes[no]}\n"
+            f"    If true: throw to monkey {iftrue}\n"
+            f"    If false: throw to monkey {iffalse}"
+        )
+
+    return "\n\n".join(blocks)
+
+
+@generator(12)
+def heightmap(rng, scale):
+    h, w = side(41, scale), max(26, side(161, scale))
+
+    # heights rise by at most one per column, so the first row is always a path,
+    # and cells apart from the first row and first and last column are lowered
+    grid = []
+    for y in range(h):
+        row = []
+        for x in range(w):
+            height = x * 25 // (w - 1)
+            if 0 < y and 0 < x < w - 1 and rng.random() < 0.3:
+                height = rng.randint(0, height)
+            row.append(chr(ord("a") + height))
+        grid.append(row)
+
+    grid[rng.randrange(h)][0] = "S"
+    grid[rng.randrange(h)][w - 1] = "E"
+    return "\n".join("".join(row) for row in grid)
+
+
+@generator(13)
+def packets(rng, scale):
+    def packet(depth=0):
+        items = []
+        for _ in range(rng.randint(0, 5)):
+            if depth < 4 and rng.random() < 0.3:
+                items.append(packet(depth + 1))
+            else:
+                items.append(rng.randint(0, 10))
+        return items
+
+    pairs = [f"{packet()}\n{packet()}" for _ in range(sized(150, scale))]
+    return "\n\n".join(pairs).replace(" ", "")
+
+
+@generator(14)
+def rock_paths(rng, scale):
+    # caves are as wide as they are deep, centered around the sand source
+    depth = side(170, scale)
+    xmin, xmax = max(1, 500 - depth // 2), 500 + depth // 2
+
+    lines = []
+    for _ in range(sized(150, scale)):
+        x, y = rng.randint(xmin, xmax), rng.randint(10, depth)
+        points = [(x, y)]
+        for i in range(rng.randint(1, 5)):
+            # alternate between horizontal and vertical segments
+            if i % 2 == 0:
+                x = min(xmax, max(xmin, x + rng.randint(-10, 10)))
+            else:
+                y = min(depth, max(10, y + rng.randint(-10, 10)))
+            points.append((x, y))
+        lines.append(" -> ".join(f"{x},{y}" for x, y in points))
+
+    return "\n".join(lines)
+
+
+@generator(15)
+def sensors(rng, scale, limit=4_000_000):
+    def line(sx, sy, bx, by):
+        return f"Sensor at x={sx}, y={sy}: closest beacon is at x={bx}, y={by}"
+
+    # the one point that no sensor covers
+    px = rng.randint(limit // 10, limit * 9 // 10)
+    py = rng.randint(limit // 10, limit * 9 // 10)
+
+    lines = []
+    for dx, dy in [(1, 1), (1, -1), (-1, 1), (-1, -1)]:
+        # four huge sensors, diagonally around the point, cover the entire area
+        a, b = limit + rng.randint(1, 1000), limit + rng.randint(1, 1000)
+        sx, sy = px + dx * a, py + dy * b
+        lines.append(line(sx, sy, sx + dx * a, sy + dy * (b - 1)))
+
+    # two small sensors, exactly one gap apart, to pinpoint the point quickly
+    k = rng.randint(100, 1000)
+    a = rng.randint(1, k - 1)
+    b = k - a
+    lines.append(line(px + a, py + b, px + 2 * a, py + 2 * b - 1))
+    lines.append(line(px - a, py - b, px - 2 * a, py - 2 * b + 1))
+
+    # plenty of random sensors that never reach the point
+    while len(lines) < sized(26, scale):
+        sx, sy = rng.randint(0, limit), rng.randint(0, limit)
+        dist = abs(sx - px) + abs(sy - py)
+        if dist < 2:
+            continue
+        radius = rng.randint(1, dist - 1)
+        dx = rng.randint(-radius, radius)
+        dy = rng.choice([-1, 1]) * (radius - abs(dx))
+        lines.append(line(sx, sy, sx + dx, sy + dy))
+
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+@generator(16)
+def valves(rng, scale, nflows=15):
+    n = max(nflows + 1, sized(60, scale))
+
+    # unique names, with valve AA being the start
+    length = 2 if n <= 26**2 else 3
+    names = set()
+    while len(names) < n - 1:
+        names.add("".join(rng.choices(string.ascii_uppercase, k=length)))
+        names.discard("AA")
+    names = ["AA"] + sorted(names)
+
+    # random spanning tree, plus some shortcuts
+    edges = set()
+    for i in range(1, n):
+        edges.add(frozenset((i, rng.randrange(i))))
+    while len(edges) < n - 1 + n // 4:
+        i, j = rng.sample(range(n), 2)
+        edges.add(frozenset((i, j)))
+
+    tunnels = [[] for _ in range(n)]
+    for i, j in map(tuple, edges):
+        tunnels[i].append(names[j])
+        tunnels[j].append(names[i])
+
+    # only a few valves have a non-zero flow rate
+    flows = [0] * n
+    for i in rng.sample(range(1, n), nflows):
+        flows[i] = rng.randint(3, 25)
+
+    lines = []
+    for i in range(n):
+        if len(tunnels[i]) == 1:
+            lead = f"tunnel leads to valve {tunnels[i][0]}"
+        else:
+            lead = f"tunnels lead to valves {', '.join(sorted(tunnels[i]))}"
+        lines.append(f"Valve {names[i]} has flow rate={flows[i]}; {lead}")
+
+    return "\n".join(lines)
+
+
+@generator(17)
+def jets(rng, scale):
+    return "".join(rng.choices("<>", k=sized(10091, scale)))
+
+
+@generator(18)
+def cubes(rng, scale):
+    n = side(20, scale, dims=3)
+    count = min(n**3, sized(2000, scale))
+
+    lines = []
+    for i in rng.sample(range(n**3), count):
+        x, y, z = i % n, i // n % n, i // n // n
+        lines.append(f"{x + 1},{y + 1},{z + 1}")
+
+    return "\n".join(lines)
+
+
+@generator(19)
+def blueprints(rng, scale):
+    lines = []
+    for i in range(1, sized(30, scale) + 1):
+        lines.append(
+            f"Blueprint {i}: "
+            f"Each ore robot costs {rng.randint(2, 4)} ore. "
+            f"Each clay robot costs {rng.randint(2, 4)} ore. "
+            f"Each obsidian robot costs {rng.randint(2, 4)} ore "
+            f"and {rng.randint(5, 20)} clay. "
+            f"Each geode robot costs {rng.randint(2, 4)} ore "
+            f"and {rng.randint(7, 20)} obsidian."
+        )
+
+    return "\n".join(lines)
+
+
+@generator(20)
+def encrypted_file(rng, scale):
+    n = sized(5000, scale)
+    nums = [rng.choice([-1, 1]) * rng.randint(1, 10000) for _ in range(n - 1)]
+
+    # exactly one zero, which marks the start
+    nums.insert(rng.randrange(n), 0)
+    return "\n".join(map(str, nums))
+
+
+@generator(21)
+def monkey_math(rng, scale):
+    n = sized(2000, scale)
+
+    # unique names, apart from the root and the human
+    length = 4 if n < 26**4 // 2 else 5
+    names = set()
+    while len(names) < n:
+        names.add("".join(rng.choices(string.ascii_lowercase, k=length)))
+        names -= {"root", "humn"}
+    names = list(names)
+
+    jobs, leaves = {}, []
+
+    def build(name, value, budget):
+        # leaves yell their value, which must be a non-negative number
+        if budget <= 2:
+            jobs[name] = str(value)
+            leaves.append(name)
+            return
+
+        # otherwise, split the value into an operation of two others,
+        # but always in a way that only leads to non-negative integers
+        op = rng.choice("+-*/")
+        divisors = [d for d in range(2, 10) if value > 0 and value % d == 0]
+        if op == "*" and not divisors:
+            op = "+"
+        if op == "/" and value * 10 > 10**12:
+            op = "-"
+
+        if op == "+":
+            a = rng.randint(0, value)
+            b = value - a
+        elif op == "-":
+            b = rng.randint(0, 20)
+            a = value + b
+        elif op == "*":
+            b = rng.choice(divisors)
+            a = value // b
+        else:
+            b = rng.randint(1, 10)
+            a = value * b
+
+        left = rng.randint(1, budget - 2)
+        right = budget - 1 - left
+        na, nb = names.pop(), names.pop()
+        jobs[name] = f"{na} {op} {nb}"
+        build(na, a, left)
+        build(nb, b, right)
+
+    # both sides of the root are equal, so that the human's number solves part 2
+    value = rng.randint(10**10, 10**12)
+    left, right = names.pop(), names.pop()
+    jobs["root"] = f"{left} + {right}"
+    build(left, value, n // 2)
+    build(right, value, n - n // 2 - 1)
+
+    # the human is one of the leaves
+    humn = rng.choice(leaves)
+    jobs = {("humn" if k == humn else k): v for k, v in jobs.items()}
+    for name, job in jobs.items():
+        if " " in job:
+            a, op, b = job.split()
+            a, b = ("humn" if a == humn else a), ("humn" if b == humn else b)
+            jobs[name] = f"{a} {op} {b}"
+
+    lines = [f"{name}: {job}" for name, job in jobs.items()]
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+@generator(22)
+def monkey_map(rng, scale, tile_size=50):
+    # the cube net that the edge mapping of the solution is made for
+    faces = {(1, 0), (2, 0), (1, 1), (0, 2), (1, 2), (0, 3)}
+
+    rows = []
+    for y in range(4 * tile_size):
+        row = []
+        for x in range(3 * tile_size):
+            if (x // tile_size, y // tile_size) not in faces:
+                row.append(" ")
+            elif (x, y) != (tile_size, 0) and rng.random() < 0.1:
+                row.append("#")
+            else:
+                row.append(".")
+        rows.append("".join(row).rstrip())
+
+    # walk and turn, always ending with a walk
+    steps = [str(rng.randint(1, tile_size)) for _ in range(sized(2000, scale) + 1)]
+    turns = rng.choices("LR", k=len(steps) - 1)
+    path = "".join(s + t for s, t in zip(steps, turns)) + steps[-1]
+
+    return "\n".join(rows) + "\n\n" + path
+
+
+@generator(23)
+def elves(rng, scale):
+    n = side(70, scale)
+    return "\n".join("".join(rng.choices(".#", k=n)) for _ in range(n))
+
+
+@generator(24)
+def blizzard_basin(rng, scale):
+    w, h = side(120, scale), side(25, scale)
+
+    rows = ["#." + "#" * w]
+    for _ in range(h):
+        row = []
+        for x in range(w):
+            # no vertical blizzards in the start and goal columns
+            symbols = "<>" if x in (0, w - 1) else "<>^v"
+            row.append(rng.choice(symbols) if rng.random() < 0.4 else ".")
+        rows.append("#" + "".join(row) + "#")
+    rows.append("#" * w + ".#")
+
+    return "\n".join(rows)
+
+
+@generator(25)
+def snafu_numbers(rng, scale):
+    nums = [rng.randint(1, 10**15) for _ in range(sized(120, scale))]
+    return "\n".join(map(dec2snafu, nums))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic inputs")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("-s", "--scale", type=float, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(generate(args.day, args.scale, args.seed))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# Advent of Code 2022, Graph
+# (c) blu3r4y
+
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+import numpy as np
+
+# distance between nodes that are not connected at all
+UNREACHABLE = -1
+
+
+class Graph:
+    """
+    An unweighted graph over nodes numbered 0 to n - 1, stored as compressed
+    sparse rows, i.e., the neighbors of node i are indices[indptr[i]:indptr[i + 1]].
+    Distances are computed by breadth-first searches from many sources at once.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray):
+        self.indptr, self.indices = indptr, indices
+
+    @classmethod
+    def from_edges(cls, n: int, sources, targets, directed: bool = False) -> "Graph":
+        # node indices, even if there are no edges (which would be float arrays)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if not directed:
+            sources, targets = (
+                np.concatenate((sources, targets)),
+                np.concatenate((targets, sources)),
+            )
+
+        # sort the edges by source, so that each node has a contiguous slice
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        return cls(indptr, targets[order])
+
+    @classmethod
+    def from_adjacency(
+        cls, adjacency: Dict[Hashable, Iterable[Hashable]], directed: bool = False
+    ) -> Tuple["Graph", List[Hashable]]:
+        # numbers the nodes in order of appearance, returns the graph and names
+        index = {}
+        for node, childs in adjacency.items():
+            index.setdefault(node, len(index))
+            for child in childs:
+                index.setdefault(child, len(index))
+
+        edges = [(index[a], index[b]) for a, bs in adjacency.items() for b in bs]
+        sources, targets = zip(*edges) if edges else ((), ())
+        sources = np.array(sources, dtype=np.int64)
+        targets = np.array(targets, dtype=np.int64)
+        return cls.from_edges(len(index), sources, targets, directed), list(index)
+
+    @property
+    def n(self) -> int:
+        return len(self.indptr) - 1
+
+    def neighbors(self, node: int) -> np.ndarray:
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def degrees(self, nodes) -> np.ndarray:
+        nodes = np.asarray(nodes)
+        return self.indptr[nodes + 1] - self.indptr[nodes]
+
+    def distances(self, sources=None, dtype=np.int32) -> np.ndarray:
+        # shortest path lengths from each source (rows) to all nodes (columns),
+        # level by level, where the frontier holds (row, node) pairs of all sources
+        sources = np.arange(self.n) if sources is None else np.asarray(sources)
+        dist = np.full((len(sources), self.n), UNREACHABLE, dtype=dtype)
+
+        rows, nodes = np.arange(len(sources)), sources
+        dist[rows, nodes] = 0
+
+        level = 0
+        while len(nodes) > 0:
+            level += 1
+
+            # all neighbors of all frontier nodes
+            degrees = self.degrees(nodes)
+            offsets = np.cumsum(degrees) - degrees
+            starts = np.repeat(self.indptr[nodes] - offsets, degrees)
+            rows = np.repeat(rows, degrees)
+            nodes = self.indices[starts + np.arange(len(starts))]
+
+            # only keep the ones that we see for the first time, once each
+            fresh = dist[rows, nodes] == UNREACHABLE
+            rows, nodes = rows[fresh], nodes[fresh]
+            dist[rows, nodes] = level
+
+            _, first = np.unique(rows * self.n + nodes, return_index=True)
+            rows, nodes = rows[first], nodes[first]
+
+        return dist
+
+    def contract(self, keep) -> np.ndarray:
+        # shortest path lengths between the kept nodes only, i.e., paths may
+        # still pass through all other nodes, which are dropped afterwards
+        keep = np.asarray(keep)
+        return self.distances(keep)[:, keep]
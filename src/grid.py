@@ -0,0 +1,124 @@
+# Advent of Code 2022, Grid
+# (c) blu3r4y
+
+from typing import Callable, Dict, Iterable, Tuple
+
+import numpy as np
+
+# (dy, dx) offsets of the neighborhoods
+ORTHOGONAL = ((-1, 0), (1, 0), (0, -1), (0, 1))
+DIAGONAL = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+MOORE = ORTHOGONAL + DIAGONAL
+
+
+class Grid:
+    """
+    A 2D grid backed by one contiguous numpy array. Cells can be addressed
+    by (y, x) or by a packed integer index, i.e., y * width + x, which is
+    cheaper to hash and to do arithmetic with in hot loops.
+    """
+
+    def __init__(self, cells: np.ndarray):
+        self.cells = np.ascontiguousarray(cells)
+        self.height, self.width = self.cells.shape
+
+    @classmethod
+    def parse(
+        cls,
+        data: str,
+        mapping: Dict[str, int] | Callable[[str], int] = None,
+        fill: str = " ",
+        dtype=np.uint8,
+    ) -> "Grid":
+        lines = data.split("\n")
+        width = max(map(len, lines))
+        text = "".join(line.ljust(width, fill) for line in lines)
+        flat = np.frombuffer(bytearray(text, "ascii"), dtype=np.uint8)
+
+        # translate every character at once, defaults to their code point
+        if mapping is not None:
+            lookup = np.zeros(128, dtype=dtype)
+            for ch in set(text):
+                lookup[ord(ch)] = mapping(ch) if callable(mapping) else mapping[ch]
+            flat = lookup[flat]
+
+        return cls(flat.astype(dtype, copy=False).reshape(len(lines), width))
+
+    @classmethod
+    def full(cls, height: int, width: int, fill=0, dtype=np.uint8) -> "Grid":
+        return cls(np.full((height, width), fill_value=fill, dtype=dtype))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.cells.shape
+
+    @property
+    def size(self) -> int:
+        return self.cells.size
+
+    @property
+    def nbytes(self) -> int:
+        return self.cells.nbytes
+
+    @property
+    def flat(self) -> np.ndarray:
+        # zero-copy view, indexed by packed coordinates
+        return self.cells.reshape(-1)
+
+    @property
+    def buffer(self) -> memoryview:
+        # zero-copy view that yields plain python scalars, for scalar hot loops
+        return self.flat.data
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __setitem__(self, key, value):
+        self.cells[key] = value
+
+    def __eq__(self, other):
+        return isinstance(other, Grid) and np.array_equal(self.cells, other.cells)
+
+    def pack(self, y, x):
+        return y * self.width + x
+
+    def unpack(self, i):
+        return divmod(i, self.width)
+
+    def row(self, y: int) -> np.ndarray:
+        return self.cells[y, :]
+
+    def col(self, x: int) -> np.ndarray:
+        return self.cells[:, x]
+
+    def in_bounds(self, y, x):
+        # works on scalars and arrays alike
+        return (0 <= y) & (y < self.height) & (0 <= x) & (x < self.width)
+
+    def find(self, value) -> np.ndarray:
+        return np.flatnonzero(self.flat == value)
+
+    def neighbors(
+        self, indices: np.ndarray, offsets: Iterable[Tuple[int, int]] = ORTHOGONAL
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # packed neighbor indices of shape (len(indices), len(offsets)) and a
+        # mask that tells which of them are within bounds
+        offsets = np.array(offsets)
+        y, x = np.divmod(np.asarray(indices)[:, None], self.width)
+        ny, nx = y + offsets[:, 0], x + offsets[:, 1]
+        return ny * self.width + nx, self.in_bounds(ny, nx)
+
+    def shifted(self, dy: int, dx: int) -> np.ndarray:
+        # zero-copy view of the neighbors in direction (dy, dx) of all
+        # inner cells, where the outermost ring of cells acts as a border
+        h, w = self.shape
+        return self.cells[1 + dy : h - 1 + dy, 1 + dx : w - 1 + dx]
+
+    def interior(self) -> np.ndarray:
+        return self.shifted(0, 0)
+
+    def pad(self, width, fill=0) -> "Grid":
+        return Grid(np.pad(self.cells, width, constant_values=fill))
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells.copy())
@@ -0,0 +1,119 @@
+# Advent of Code 2022, Input Store
+# (c) blu3r4y
+
+import argparse
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+YEAR = 2022
+
+# inputs are stored once per content hash in `objects/`,
+# while named references in `refs/` point to these hashes
+STORE_DIR = Path(os.getenv("AOC_INPUT_DIR", Path(__file__).parents[1] / "inputs"))
+
+# never fall back to aocd (and thus the network) if set
+OFFLINE = os.getenv("AOC_OFFLINE", "0") not in ("", "0")
+
+
+def content_hash(data: str) -> str:
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def object_path(key: str) -> Path:
+    return STORE_DIR / "objects" / key[:2] / key
+
+
+def ref_path(name: str) -> Path:
+    return STORE_DIR / "refs" / name
+
+
+def put(data: str, name: str = None) -> str:
+    key = content_hash(data)
+    path = object_path(key)
+
+    # objects are immutable, so we only ever write them once
+    if not path.exists():
+        atomic_write(path, data)
+    if name is not None:
+        atomic_write(ref_path(name), key)
+
+    return key
+
+
+def resolve(name: str) -> str | None:
+    try:
+        return ref_path(name).read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
+def read(key: str) -> str:
+    return object_path(key).read_text()
+
+
+def get(name: str) -> str:
+    if (key := resolve(name)) is None:
+        raise FileNotFoundError(f"no input named '{name}' in {STORE_DIR}")
+    return read(key)
+
+
+def puzzle_input(day: int, offline: bool = None) -> str:
+    offline = OFFLINE if offline is None else offline
+    name = f"day{day}"
+
+    if (key := resolve(name)) is not None:
+        return read(key)
+    if offline:
+        raise FileNotFoundError(
+            f"no input for day {day} in {STORE_DIR} and offline mode is enabled, "
+            f"use 'python src/inputs.py import {day} <file>' to add it"
+        )
+
+    # only now pay for aocd, which possibly needs the network
+    from aocd.models import Puzzle
+
+    data = Puzzle(year=YEAR, day=day).input_data
+    put(data, name)
+    return data
+
+
+def atomic_write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local input store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    fetch = commands.add_parser("fetch", help="download inputs through aocd")
+    fetch.add_argument("days", nargs="*", type=int, default=range(1, 26))
+    imp = commands.add_parser("import", help="add an input from a file")
+    imp.add_argument("day", type=int)
+    imp.add_argument("file", type=Path)
+    commands.add_parser("list", help="list stored inputs")
+    args = parser.parse_args(argv)
+
+    if args.command == "fetch":
+        for day in args.days:
+            puzzle_input(day, offline=False)
+            print(f"day{day} -> {resolve(f'day{day}')}")
+
+    elif args.command == "import":
+        # strip the trailing newline, just like aocd does
+        data = args.file.read_text().rstrip("\r\n")
+        print(f"day{args.day} -> {put(data, f'day{args.day}')}")
+
+    elif args.command == "list":
+        # named references may be nested, e.g., `refs/synthetic/...`
+        refs = [p.relative_to(ref_path("")) for p in ref_path("").rglob("*")]
+        refs = [ref.as_posix() for ref in refs if ref_path(ref).is_file()]
+        for name in sorted(refs, key=lambda name: (len(name), name)):
+            print(f"{name} -> {resolve(name)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
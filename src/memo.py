@@ -0,0 +1,172 @@
+# Advent of Code 2022, Memoization
+# (c) blu3r4y
+
+import os
+import re
+import sys
+import weakref
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "currsize", "nbytes", "budget"]
+)
+
+# rough size of an entry in an ordered dict, on top of its key and value
+ENTRY_OVERHEAD = 100
+
+UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+def parse_bytes(size: int | str | None) -> int | None:
+    # e.g. 1024, "512M" or "12 GiB"
+    if size is None or isinstance(size, int):
+        return size
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*", size, re.I)
+    if m is None:
+        raise ValueError(f"invalid byte size '{size}'")
+    return int(float(m[1]) * UNITS[m[2].upper()])
+
+
+# overrides the budget of every cache, e.g., on memory-constrained workers
+BUDGET = parse_bytes(os.getenv("AOC_MEMO_BUDGET") or None)
+
+
+def sizeof(obj) -> int:
+    # numpy arrays (and things that wrap them) know their actual size
+    nbytes = getattr(obj, "nbytes", None)
+    return nbytes if isinstance(nbytes, int) else sys.getsizeof(obj)
+
+
+def memoize(budget: int | str = None, key=None):
+    """
+    Memoizes a function or method in a least-recently-used cache that is
+    bounded by an (estimated) number of bytes rather than a number of entries.
+    An optional `key` function maps the arguments to a compact key, e.g., to
+    a packed integer. Methods get one cache per instance.
+    """
+
+    def decorator(func):
+        return Memo(func, parse_bytes(budget), key)
+
+    return decorator
+
+
+class Memo:
+    def __init__(self, func, budget, key):
+        self.func, self.budget, self.key = func, budget, key
+        self.__wrapped__ = func
+
+        # metrics of caches that were already cleared or garbage collected
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        self.caches = weakref.WeakSet()
+        self.default = None
+
+    def __set_name__(self, owner, name):
+        self.attr = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        # the cache shadows this descriptor in the instance dict from now on
+        cached = instance.__dict__[self.attr] = Cache(self, instance).wrapper()
+        return cached
+
+    def __call__(self, *args, **kwargs):
+        if self.default is None:
+            self.default = Cache(self, None).wrapper()
+        return self.default(*args, **kwargs)
+
+    def cache_info(self) -> CacheInfo:
+        live = [c.cache_info() for c in self.caches]
+        return CacheInfo(
+            hits=self.hits + sum(c.hits for c in live),
+            misses=self.misses + sum(c.misses for c in live),
+            evictions=self.evictions + sum(c.evictions for c in live),
+            currsize=sum(c.currsize for c in live),
+            nbytes=sum(c.nbytes for c in live),
+            budget=self.budget if BUDGET is None else BUDGET,
+        )
+
+    def cache_clear(self):
+        for cache in list(self.caches):
+            cache.cache_clear()
+
+
+class Cache:
+    def __init__(self, memo: Memo, instance):
+        self.memo, self.key = memo, memo.key
+        self.budget = memo.budget if BUDGET is None else BUDGET
+
+        # only a weak reference, so that the instance can free its cache
+        self.ref = weakref.ref(instance) if instance is not None else None
+        self.data, self.nbytes = OrderedDict(), 0
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+        memo.caches.add(self)
+
+    def wrapper(self):
+        # a plain closure is cheaper to call than an object, which matters
+        # in recursive searches, where every single state goes through here
+        data, func, ref, keyfunc = self.data, self.memo.func, self.ref, self.key
+        store, move_to_end = self.store, self.data.move_to_end
+
+        def cached(*args, **kwargs):
+            if keyfunc is not None:
+                key = keyfunc(*args, **kwargs)
+            else:
+                key = args + tuple(kwargs.items()) if kwargs else args
+
+            try:
+                value = data[key]
+            except KeyError:
+                self.misses += 1
+                if ref is None:
+                    value = func(*args, **kwargs)
+                else:
+                    value = func(ref(), *args, **kwargs)
+                store(key, value)
+                return value
+
+            self.hits += 1
+            move_to_end(key)
+            return value
+
+        cached.cache_info, cached.cache_clear = self.cache_info, self.cache_clear
+        cached.__wrapped__ = func
+        return cached
+
+    def store(self, key, value):
+        self.data[key] = value
+        self.nbytes += ENTRY_OVERHEAD + sizeof(key) + sizeof(value)
+
+        # evict the least recently used entries until we are within budget
+        while self.budget is not None and self.nbytes > self.budget and self.data:
+            k, v = self.data.popitem(last=False)
+            self.nbytes -= ENTRY_OVERHEAD + sizeof(k) + sizeof(v)
+            self.evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self.data),
+            self.nbytes,
+            self.budget,
+        )
+
+    def cache_clear(self):
+        self.fold()
+        self.data.clear()
+        self.nbytes = 0
+
+    def fold(self):
+        # keep the metrics on the memoized function, across clears and instances
+        self.memo.hits += self.hits
+        self.memo.misses += self.misses
+        self.memo.evictions += self.evictions
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __del__(self):
+        self.fold()
@@ -0,0 +1,128 @@
+# Advent of Code 2022, Parsed Input Cache
+# (c) blu3r4y
+
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from grid import Grid
+from inputs import content_hash
+
+# parsed inputs, keyed by the hash of the input and of the parsing code
+CACHE_DIR = Path(os.getenv("AOC_CACHE_DIR", Path(__file__).parents[1] / ".cache"))
+
+# grid days are stored as numpy arrays, everything else is pickled
+ARRAY_CODECS = {}
+
+
+def codec(day):
+    def register(cls):
+        ARRAY_CODECS[day] = cls
+        return cls
+
+    return register
+
+
+def load(module, data):
+    day = int(module.__name__.removeprefix("day"))
+    array_codec = ARRAY_CODECS.get(day)
+
+    suffix = ".npz" if array_codec else ".pickle"
+    path = CACHE_DIR / "parsed" / f"{module.__name__}-{cache_key(module, data)}{suffix}"
+
+    # warm runs skip text parsing entirely
+    if path.exists():
+        if array_codec:
+            with np.load(path, allow_pickle=False) as arrays:
+                return array_codec.decode(module, arrays)
+        with open(path, "rb") as fh:
+            return pickle.load(fh)
+
+    parsed = module.load(data)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        if array_codec:
+            np.savez(fh, **array_codec.encode(parsed))
+        else:
+            pickle.dump(parsed, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+    return parsed
+
+
+def cache_key(module, data):
+    # changes whenever the input, the day, the helpers it uses or the codecs change
+    code = b"".join(path.read_bytes() for path in sources(module))
+    code_hash = hashlib.sha256(code).hexdigest()
+    return hashlib.sha256((code_hash + content_hash(data)).encode()).hexdigest()[:32]
+
+
+def sources(module):
+    # source files of the day, of this module, and of every module from this
+    # directory that the day imports, either directly or by one of its names
+    src = Path(__file__).parent
+    paths = {Path(module.__file__), Path(__file__)}
+    for obj in vars(module).values():
+        helper = obj
+        if not inspect.ismodule(obj):
+            helper = sys.modules.get(getattr(obj, "__module__", None))
+        path = getattr(helper, "__file__", None)
+        if path and Path(path).parent == src:
+            paths.add(Path(path))
+
+    return sorted(paths)
+
+
+@codec(8)
+@codec(14)
+@codec(23)
+class GridCodec:
+    @staticmethod
+    def encode(grid):
+        return {"grid": grid.cells}
+
+    @staticmethod
+    def decode(module, arrays):
+        return Grid(arrays["grid"])
+
+
+@codec(12)
+class HeightmapCodec:
+    @staticmethod
+    def encode(parsed):
+        grid, start, end = parsed
+        return {"grid": grid.cells, "bounds": np.array([start, end])}
+
+    @staticmethod
+    def decode(module, arrays):
+        start, end = arrays["bounds"].tolist()
+        return Grid(arrays["grid"]), start, end
+
+
+@codec(18)
+class CubesCodec:
+    @staticmethod
+    def encode(lava):
+        return {"lava": np.array(lava)}
+
+    @staticmethod
+    def decode(module, arrays):
+        return list(map(tuple, arrays["lava"].tolist()))
+
+
+@codec(24)
+class BlizzardCodec:
+    @staticmethod
+    def encode(solver):
+        return {"valley": solver.valley.cells}
+
+    @staticmethod
+    def decode(module, arrays):
+        return module.PuzzleSolver(Grid(arrays["valley"]))
@@ -0,0 +1,53 @@
+# Advent of Code 2022, Parsing
+# (c) blu3r4y
+
+import re
+from typing import List, Tuple
+
+INTEGER = re.compile(r"-?\d+")
+NONEMPTY = re.compile(r"^.*\S", re.MULTILINE)
+
+# the subset of `parse` format fields that we use, i.e., "{}", "{:d}", "{:w}"
+FIELDS = {"": (r"(.+?)", str), "d": (r"(-?\d+)", int), "w": (r"(\w+)", str)}
+FIELD = re.compile(r"\{:?(\w?)\}")
+
+
+class Format:
+    """
+    A `parse` style format that is compiled to a regular expression once,
+    so that whole inputs can be matched at once instead of line by line.
+    """
+
+    def __init__(self, fmt: str):
+        self.format = fmt
+        self.types = [FIELDS[t][1] for t in FIELD.findall(fmt)]
+
+        # escape the literal text between the fields
+        literals = FIELD.split(fmt)[::2]
+        groups = [FIELDS[t][0] for t in FIELD.findall(fmt)] + [""]
+        pattern = "".join(re.escape(lit) + grp for lit, grp in zip(literals, groups))
+        self.regex = re.compile(f"^{pattern}$", re.MULTILINE)
+
+    def match(self, line: str) -> Tuple | None:
+        if m := self.regex.fullmatch(line):
+            return tuple(t(v) for t, v in zip(self.types, m.groups()))
+        return None
+
+    def findall(self, text: str, strict: bool = True) -> List[Tuple]:
+        # all matches of all lines, with the conversion done in bulk,
+        # where strict mode makes sure that no non-empty line was skipped
+        matches = self.regex.findall(text)
+        if strict:
+            nlines = len(matches) * (self.format.count("\n") + 1)
+            assert nlines == len(NONEMPTY.findall(text)), "some lines did not match"
+
+        if len(self.types) == 1:
+            return [(v,) for v in map(self.types[0], matches)]
+
+        columns = zip(*matches) if matches else [[]] * len(self.types)
+        columns = [list(map(t, col)) for t, col in zip(self.types, columns)]
+        return list(zip(*columns))
+
+
+def ints(text: str) -> List[int]:
+    return list(map(int, INTEGER.findall(text)))
@@ -0,0 +1,147 @@
+# Advent of Code 2022, Profiling
+# (c) blu3r4y
+
+import cProfile
+import functools
+import inspect
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from funcy import print_calls, print_durations
+
+# one report per day, part and variant, so that parts may finish concurrently
+PROFILE_DIR = Path(os.getenv("AOC_PROFILE_DIR", Path(__file__).parents[1] / "profiles"))
+
+# the number of slowest functions (by cumulative time) that are reported
+TOP = 25
+
+
+def enabled():
+    # checked on every call, so that the runner can enable it after importing
+    return os.getenv("AOC_PROFILE", "0") not in ("", "0")
+
+
+def instrument(func):
+    # replaces `@print_calls @print_durations(unit="ms")` on the parts
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not enabled():
+            return func(*args, **kwargs)
+        return profiled(func, args, kwargs)
+
+    return print_calls(print_durations(unit="ms")(wrapper))
+
+
+def profiled(func, args, kwargs):
+    module = sys.modules[func.__module__]
+    profiler = cProfile.Profile()
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        result = profiler.runcall(func, *args, **kwargs)
+    finally:
+        duration = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    section = {
+        "duration": duration,
+        "peak_memory": peak,
+        **function_stats(module, pstats.Stats(profiler)),
+        "caches": cache_stats(module),
+    }
+    write_report(report_name(module, func, kwargs), section)
+
+    return result
+
+
+def day_name(module):
+    # a day that is run on its own is `__main__`, so name it after its file
+    if module.__name__ == "__main__":
+        return Path(module.__file__).stem
+    return module.__name__
+
+
+def report_name(module, func, kwargs):
+    # e.g. `day14.part2`, or `day14.part2.sweep` if a mode or engine is chosen,
+    # so that checking one engine against another keeps both reports
+    variants = [v for v in kwargs.values() if isinstance(v, str)]
+    return ".".join([day_name(module), func.__name__, *variants])
+
+
+def function_stats(module, stats):
+    names, src = qualnames(module), Path(__file__).parent
+    calls, top = {}, []
+
+    for (file, line, name), (cc, nc, tt, ct, _) in stats.stats.items():
+        label = names.get((file, line)) or location(file, line, name)
+        entry = {"ncalls": nc, "primitive": cc, "tottime": tt, "cumtime": ct}
+
+        # call counts of our own code, i.e., the hot inner functions
+        if Path(file).parent == src and name != "<module>":
+            calls[label] = entry
+        top.append({"function": label, **entry})
+
+    top.sort(key=lambda e: e["cumtime"], reverse=True)
+    return {"calls": dict(sorted(calls.items())), "top": top[:TOP]}
+
+
+def location(file, line, name):
+    # like pstats, but without the machine-specific part of the path
+    if file == "~":
+        return name
+    path = Path(file)
+    return f"{path.parent.name}/{path.name}:{line}({name})"
+
+
+def cache_stats(module):
+    caches = {}
+    for name, obj in cached_functions(module):
+        info = obj.cache_info()
+        total = info.hits + info.misses
+        caches[name] = {
+            **info._asdict(),
+            "ratio": info.hits / total if total else None,
+        }
+    return dict(sorted(caches.items()))
+
+
+def cached_functions(module):
+    # `functools.cache` and `lru_cache` wrappers, on module level and in classes
+    for name, obj in vars(module).items():
+        if hasattr(obj, "cache_info"):
+            yield name, obj
+        elif inspect.isclass(obj) and obj.__module__ == module.__name__:
+            for attr, member in vars(obj).items():
+                if hasattr(member, "cache_info"):
+                    yield f"{name}.{attr}", member
+
+
+def qualnames(module):
+    # cProfile only knows code names, so map code locations back to qualified names
+    names = {}
+    for obj in vars(module).values():
+        members = vars(obj).values() if inspect.isclass(obj) else [obj]
+        for member in members:
+            member = inspect.unwrap(getattr(member, "__func__", member))
+            code = getattr(member, "__code__", None)
+            if code is not None and member.__module__ == module.__name__:
+                label = f"{day_name(module)}.{member.__qualname__}"
+                names[code.co_filename, code.co_firstlineno] = label
+    return names
+
+
+def write_report(name, section):
+    path = PROFILE_DIR / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # replaced at once, so that readers never see a partially written report
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(section, indent=2, sort_keys=True) + "\n")
+    os.replace(tmp, path)
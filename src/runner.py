@@ -0,0 +1,244 @@
+# Advent of Code 2022, Runner
+# (c) blu3r4y
+
+import argparse
+import contextlib
+import importlib
+import inspect
+import multiprocessing as mp
+import os
+import subprocess
+import sys
+import time
+import traceback
+from collections import deque, namedtuple
+from multiprocessing.connection import wait
+from pathlib import Path
+
+# plots must never block a worker process
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import parsecache  # noqa: E402
+from inputs import puzzle_input  # noqa: E402
+
+DAYS = list(range(1, 26))
+
+# import times are noisy, so the fastest of a few runs is reported
+IMPORT_REPEAT = 5
+
+Job = namedtuple("Job", ["day", "part"])
+Result = namedtuple("Result", ["day", "part", "status", "answer", "tload", "tsolve"])
+
+
+def import_day(day):
+    return importlib.import_module(f"day{day}")
+
+
+def import_time(day, repeat=IMPORT_REPEAT):
+    # best cumulative import time of a day over a few fresh interpreters
+    times = [t for t in (import_once(day) for _ in range(repeat)) if t is not None]
+    return min(times, default=None)
+
+
+def import_once(day):
+    # cumulative import time of a day in a fresh interpreter, in seconds
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import day{day}"],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = [f.strip() for f in line.removeprefix("import time:").split("|")]
+        if len(fields) == 3 and fields[2] == f"day{day}":
+            return int(fields[1]) / 1e6
+    return None
+
+
+def solutions(module):
+    # the parts that a day module provides, i.e., day 25 only has one
+    return {
+        p: getattr(module, f"part{p}") for p in (1, 2) if hasattr(module, f"part{p}")
+    }
+
+
+def call_part(func, parsed):
+    # days like 12 return a tuple from `load()` that is splatted into the parts,
+    # while days like 5 pass their tuple on as a single argument
+    params = inspect.signature(func).parameters.values()
+    required = [p for p in params if p.default is p.empty]
+    if isinstance(parsed, tuple) and len(required) > 1:
+        return func(*parsed)
+    return func(parsed)
+
+
+def execute(job, data, parse_cache=False):
+    module = import_day(job.day)
+    func = solutions(module)[job.part]
+
+    # parse the input, then solve it
+    t0 = time.perf_counter()
+    parsed = parsecache.load(module, data) if parse_cache else module.load(data)
+    t1 = time.perf_counter()
+    answer = call_part(func, parsed)
+    t2 = time.perf_counter()
+
+    return answer, t1 - t0, t2 - t1
+
+
+def worker(job, conn, verbose, offline, parse_cache):
+    try:
+        data = puzzle_input(job.day, offline=offline)
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                devnull = stack.enter_context(open(os.devnull, "w"))
+                stack.enter_context(contextlib.redirect_stdout(devnull))
+                stack.enter_context(contextlib.redirect_stderr(devnull))
+            answer, tload, tsolve = execute(job, data, parse_cache)
+        conn.send(("ok", str(answer), tload, tsolve))
+    except Exception as ex:
+        if verbose:
+            traceback.print_exc()
+        conn.send(("error", f"{type(ex).__name__}: {ex}", None, None))
+    finally:
+        conn.close()
+
+
+def run(jobs, processes, timeout, verbose=False, offline=None, parse_cache=False):
+    pending, running, results = deque(jobs), {}, []
+
+    while pending or running:
+        # fill up the pool with new jobs
+        while pending and len(running) < processes:
+            job = pending.popleft()
+            recv, send = mp.Pipe(duplex=False)
+            proc = mp.Process(
+                target=worker,
+                args=(job, send, verbose, offline, parse_cache),
+                daemon=True,
+            )
+            proc.start()
+            send.close()
+            running[recv] = (job, proc, time.perf_counter())
+
+        # collect finished jobs
+        for conn in wait(list(running.keys()), timeout=0.1):
+            job, proc, _ = running.pop(conn)
+            try:
+                results.append(Result(*job, *conn.recv()))
+            except EOFError:
+                msg = f"worker died with exit code {proc.exitcode}"
+                results.append(Result(*job, "error", msg, None, None))
+            proc.join()
+            conn.close()
+
+        # kill jobs that exceeded their time limit
+        now = time.perf_counter()
+        for conn, (job, proc, start) in list(running.items()):
+            if timeout is not None and now - start > timeout:
+                proc.kill()
+                proc.join()
+                conn.close()
+                del running[conn]
+                results.append(Result(*job, "timeout", None, None, None))
+
+    return sorted(results, key=lambda r: (r.day, r.part))
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+    if seconds >= 60:
+        return f"{int(seconds // 60)} min {int(seconds % 60)} sec"
+    if seconds < 0.01:
+        return f"{seconds * 1000:.2f} ms"
+    return f"{seconds * 1000:,.0f} ms"
+
+
+def shorten(text, width=40):
+    return text if len(text) <= width else text[: width - 3] + "..."
+
+
+def print_table(results, wall, imports=None):
+    header = ("Day", "Part", "Status", "Answer", "Load", "Solve")
+    header += ("Import",) if imports else ()
+    rows = [
+        (
+            str(r.day),
+            str(r.part),
+            r.status,
+            shorten(r.answer) if r.answer is not None else "-",
+            format_duration(r.tload),
+            format_duration(r.tsolve),
+        )
+        + ((format_duration(imports.get(r.day)),) if imports else ())
+        for r in results
+    ]
+
+    # right-align numbers and durations, left-align text
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    align = [str.rjust, str.rjust, str.ljust, str.ljust, str.rjust, str.rjust]
+    align += [str.rjust] if imports else []
+    for row in [header] + rows:
+        print(" | ".join(a(c, w) for a, c, w in zip(align, row, widths)))
+
+    nok, total = sum(1 for r in results if r.status == "ok"), len(results)
+    print(f"\n{nok}/{total} parts solved in {format_duration(wall)} wall-clock time")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run all solutions in parallel")
+    parser.add_argument("days", nargs="*", type=int, default=DAYS, help="days to run")
+    parser.add_argument("-j", "--processes", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "-t", "--timeout", type=float, default=60, help="seconds per part"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="show solver output"
+    )
+    parser.add_argument(
+        "--offline", action="store_true", default=None, help="never fall back to aocd"
+    )
+    parser.add_argument(
+        "--parse-cache", action="store_true", help="cache parsed inputs on disk"
+    )
+    parser.add_argument(
+        "--import-time", action="store_true", help="measure module import times"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="write per-day profiling reports"
+    )
+    args = parser.parse_args(argv)
+
+    # inherited by the workers, see `profiling.instrument`
+    if args.profile:
+        os.environ["AOC_PROFILE"] = "1"
+
+    # measured before anything is imported here, each day in a fresh interpreter,
+    # one after another, so that the imports do not compete for the machine
+    imports = None
+    if args.import_time:
+        imports = {day: import_time(day) for day in args.days}
+
+    # import all days once, so that forked workers don't pay for it again
+    jobs = []
+    for day in args.days:
+        jobs.extend(Job(day, part) for part in solutions(import_day(day)))
+
+    start = time.perf_counter()
+    results = run(
+        jobs,
+        args.processes,
+        args.timeout,
+        verbose=args.verbose,
+        offline=args.offline,
+        parse_cache=args.parse_cache,
+    )
+    print_table(results, time.perf_counter() - start, imports)
+
+    return 0 if all(r.status == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())